@@ -3,6 +3,24 @@ from django.contrib.auth.admin import UserAdmin
 from .models import User, University, College, Program, Course, Student, StudentCourse
 
 
+class SelectRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """
+    Related-field filter whose choices are loaded with the related model
+    admin's list_select_related, so labelling each choice with __str__
+    (College and Program name their parents) doesn't query per option.
+    """
+
+    def field_choices(self, field, request, model_admin):
+        related_admin = model_admin.admin_site._registry.get(field.related_model)
+        queryset = field.related_model._default_manager.complex_filter(field.get_limit_choices_to())
+        if related_admin is not None and related_admin.list_select_related:
+            queryset = queryset.select_related(*related_admin.list_select_related)
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return [(obj.pk, str(obj)) for obj in queryset]
+
+
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     list_display = ('email', 'display_name', 'is_staff', 'is_active')
@@ -37,27 +55,41 @@ class CollegeAdmin(admin.ModelAdmin):
     list_display = ('name', 'university', 'created_at')
     list_filter = ('university', 'created_at')
     search_fields = ('name', 'university__name')
+    list_select_related = ('university',)
 
 
 @admin.register(Program)
 class ProgramAdmin(admin.ModelAdmin):
     list_display = ('name', 'college', 'duration', 'created_at')
-    list_filter = ('college', 'duration', 'created_at')
+    list_filter = (('college', SelectRelatedFieldListFilter), 'duration', 'created_at')
     search_fields = ('name', 'college__name')
+    list_select_related = ('college__university',)
 
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'credits', 'type', 'semester', 'year', 'program')
-    list_filter = ('type', 'semester', 'year', 'program')
+    list_filter = ('type', 'semester', 'year', ('program', SelectRelatedFieldListFilter))
     search_fields = ('code', 'name', 'program__name')
+    list_select_related = ('program__college',)
+    show_full_result_count = False
+    list_per_page = 50
 
 
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = ('user', 'university', 'college', 'program', 'year', 'semester')
-    list_filter = ('university', 'college', 'program', 'year', 'semester')
+    list_filter = (
+        'university',
+        ('college', SelectRelatedFieldListFilter),
+        ('program', SelectRelatedFieldListFilter),
+        'year',
+        'semester',
+    )
     search_fields = ('user__display_name', 'user__email', 'program__name')
+    list_select_related = ('user', 'university', 'college__university', 'program__college')
+    show_full_result_count = False
+    list_per_page = 50
 
 
 @admin.register(StudentCourse)
@@ -65,8 +97,16 @@ class StudentCourseAdmin(admin.ModelAdmin):
     list_display = ('student', 'courses_count', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('student__user__display_name',)
+    list_select_related = ('student__user', 'student__program')
+    show_full_result_count = False
+    list_per_page = 50
     readonly_fields = ('courses',)
-    
+
+    def get_queryset(self, request):
+        # StudentCourse.__str__ walks student -> user, so the change, delete and
+        # search views need the changelist's joins too
+        return super().get_queryset(request).select_related(*self.list_select_related)
+
     def courses_count(self, obj):
         return len(obj.courses) if obj.courses else 0
     courses_count.short_description = 'Number of Courses'
\ No newline at end of file
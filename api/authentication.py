@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .serializers import StudentSerializer
+
+
+class StudentJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication whose user lookup also joins the user's Student with
+    everything StudentSerializer reads, so views find the profile on
+    request.user instead of querying for it (see views.get_student).
+
+    The stock get_user is kept, checks and errors included: it looks the user
+    up through self.user_model.objects, which is swapped here for a queryset
+    with the join. It only reads .objects and .DoesNotExist off the model
+    (simplejwt 5.3.0); api.tests.AuthenticationTests covers the lookup.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_model = SimpleNamespace(
+            objects=self.user_model.objects.select_related(
+                *StudentSerializer.nested_select_related('student_profile')
+            ),
+            DoesNotExist=self.user_model.DoesNotExist,
+        )
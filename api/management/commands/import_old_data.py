@@ -1,12 +1,210 @@
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 from django.utils.text import slugify
 from api.models import University, College, Program, Course
-import json
+from api.signals import invalidate_catalogue
+from collections import defaultdict
+import csv
+import functools
+import io
+import ijson
+import itertools
 import os
+import re
 import decimal
 
 
+COURSE_BATCH_SIZE = 1000
+COURSE_UPDATE_FIELDS = ['name', 'credits', 'type', 'semester', 'year']
+COPY_COURSE_FIELDS = ['id', 'program', 'code', 'name', 'credits', 'type', 'semester', 'year']
+COURSE_TYPE_VALUES = frozenset(value for value, _ in Course.COURSE_TYPES)
+
+# UDSM college inference tables, compiled once at import time
+DEFAULT_COLLEGE = 'College of Science and Technology'
+COLLEGE_CODES = {
+    'COET': 'College of Engineering and Technology',
+    'COICT': 'College of Information and Communication Technologies',
+    'COBASS': 'College of Business and Social Sciences',
+    'COHAS': 'College of Health and Allied Sciences',
+    'COST': 'College of Science and Technology',
+    'COA': 'College of Agriculture',
+    'COED': 'College of Education',
+    'COMREC': 'College of Natural and Applied Sciences',
+}
+SUBJECT_COLLEGES = {
+    'engineering': 'College of Engineering and Technology',
+    'science': 'College of Science and Technology',
+    'business': 'College of Business and Social Sciences',
+    'education': 'College of Education',
+    'agriculture': 'College of Agriculture',
+    'health': 'College of Health and Allied Sciences',
+}
+# Checked in the order listed above, so the earlier entry wins when a name
+# mentions several codes or subjects
+COLLEGE_CODE_PATTERNS = [
+    (re.compile(r'\b' + code + r'\b', re.IGNORECASE), college)
+    for code, college in COLLEGE_CODES.items()
+]
+# "... in/of <subject>": everything after the first standalone "in" or "of"
+SUBJECT_TAIL_RE = re.compile(r'(?<!\S)(?:in|of)\s+(\S.*)', re.IGNORECASE | re.DOTALL)
+DIGITS_RE = re.compile(r'\d+')
+TRAILING_DIGIT_RE = re.compile(r'\d\Z')
+
+
+def infer_college_from_program(program_name: str) -> str:
+    """Infer the UDSM college for a program from a college code or its subject."""
+    if not program_name:
+        return DEFAULT_COLLEGE
+    for pattern, college in COLLEGE_CODE_PATTERNS:
+        if pattern.search(program_name):
+            return college
+    match = SUBJECT_TAIL_RE.search(program_name) if len(program_name.split()) >= 3 else None
+    if match:
+        subject = match.group(1).lower()
+        for keyword, college in SUBJECT_COLLEGES.items():
+            if keyword in subject:
+                return college
+    return DEFAULT_COLLEGE
+
+
+@functools.lru_cache(maxsize=4096)
+def norm(value: str) -> str:
+    """Normalize a name for use as an index key; each distinct name is slugified once."""
+    return slugify(value) if value else ''
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_credits(value: str) -> int:
+    try:
+        return int(decimal.Decimal(value))
+    except Exception:
+        return 3
+
+
+def to_credits(value) -> int:
+    """Normalize a legacy credit-hours value to an int, defaulting to 3."""
+    if type(value) is int:
+        return value
+    if isinstance(value, float):
+        try:
+            return int(value)
+        except (OverflowError, ValueError):
+            return 3
+    if isinstance(value, str):
+        # Legacy dumps repeat a handful of strings ("3.0", "4"), parse each once
+        return _parse_credits(value)
+    return 3
+
+
+def to_course_type(value) -> str:
+    """Normalize a legacy course type/category, defaulting to core."""
+    course_type = (value or 'core').lower()
+    return course_type if course_type in COURSE_TYPE_VALUES else 'core'
+
+
+def to_semester(value) -> int:
+    """Normalize a legacy semester value ("Semester 2", 2, "2") to an int, defaulting to 1."""
+    if isinstance(value, str):
+        match = DIGITS_RE.search(value)
+        return int(match.group()) if match else 1
+    try:
+        return int(value)
+    except Exception:
+        return 1
+
+
+def insert_courses(courses):
+    """Insert new Course rows, streaming them through COPY on PostgreSQL.
+
+    Other backends fall back to bulk_create. Ids are sent explicitly; the
+    timestamps are left to the column defaults set up in migration 0013.
+    """
+    if connection.vendor != 'postgresql':
+        Course.objects.bulk_create(courses, batch_size=COURSE_BATCH_SIZE)
+        return
+    if not courses:
+        return
+
+    fields = [Course._meta.get_field(name) for name in COPY_COURSE_FIELDS]
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for course in courses:
+        writer.writerow([field.get_db_prep_value(getattr(course, field.attname), connection) for field in fields])
+    sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+        connection.ops.quote_name(Course._meta.db_table),
+        ', '.join(connection.ops.quote_name(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2
+            buf.seek(0)
+            cursor.copy_expert(sql, buf)
+        else:
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buf.getvalue())
+
+
+def udsm_group_key(item) -> tuple:
+    """Return the (program_name, year) grouping key for a UDSM course export item."""
+    ay = item.get('academic_year')
+    if isinstance(ay, dict):
+        # academic_year may have nested program
+        prog = ay.get('program')
+        if isinstance(prog, dict):
+            prog_name = (prog.get('name') or '').strip()
+        else:
+            prog_name = str(prog or '').strip()
+        yr = ay.get('year') or ay.get('level') or item.get('year')
+    else:
+        prog_name = (item.get('program_name') or item.get('program') or '').strip()
+        yr = item.get('year') or item.get('level')
+    if isinstance(yr, str):
+        # e.g. "Year 3": the trailing digit is the year
+        match = TRAILING_DIGIT_RE.search(yr)
+        return prog_name, int(match.group()) if match else 1
+    if isinstance(yr, (int, float)):
+        return prog_name, int(yr)
+    return prog_name, 1
+
+
+@functools.lru_cache(maxsize=None)
+def legacy_model_kind(model_name: str):
+    """Classify a dumpdata model label (e.g. "caluu_app.academicyear").
+
+    A dump only carries a handful of distinct labels, so each one is
+    classified once and every later row is a cache hit.
+    """
+    if 'college' in model_name:
+        return 'college'
+    if 'program' in model_name and 'academic' not in model_name:
+        return 'program'
+    if 'academicyear' in model_name or ('academic' in model_name and 'year' in model_name):
+        return 'academic_year'
+    if 'course' in model_name:
+        return 'course'
+    return None
+
+
+def _json_root(path):
+    """Return the first significant character of the JSON document at path."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(1)
+            if not chunk or not chunk.isspace():
+                return chunk.decode('ascii', errors='replace')
+
+
+def _stream(path, method, prefix):
+    """Lazily yield ijson results for prefix, surfacing parse errors as CommandError."""
+    with open(path, 'rb') as f:
+        try:
+            yield from method(f, prefix, use_float=True)
+        except ijson.JSONError as exc:
+            raise CommandError(f"Invalid JSON in {path}: {exc}")
+
+
 class Command(BaseCommand):
     help = 'Import legacy data from old-data.json and upsert into University, College, Program, and Course tables.'
 
@@ -23,11 +221,9 @@ class Command(BaseCommand):
         if not os.path.exists(path):
             raise CommandError(f"File not found: {path}")
 
-        with open(path, 'r', encoding='utf-8') as f:
-            try:
-                payload = json.load(f)
-            except json.JSONDecodeError as exc:
-                raise CommandError(f"Invalid JSON in {path}: {exc}")
+        root = _json_root(path)
+        if root not in ('{', '['):
+            raise CommandError(f"Invalid JSON in {path}: expected an object or array at the top level")
 
         # Expected generic structure in legacy file (flexible):
         # {
@@ -35,55 +231,65 @@ class Command(BaseCommand):
         # }
         # or flat lists: { "colleges": [...], "programs": [...], "courses": [...] }
 
-        # Normalize lists (support both dict and list roots)
+        # Normalize lists (support both dict and list roots). The file is parsed
+        # incrementally so dumpdata records are folded into the compact legacy
+        # indexes below one at a time instead of materializing the whole dump.
         universities = []
         colleges = []
         programs = []
         courses = []
         udsm_course_items = []  # previous project's export shape
 
-        if isinstance(payload, dict):
-            universities = payload.get('universities') or []
-            colleges = payload.get('colleges') or []
-            programs = payload.get('programs') or []
-            courses = payload.get('courses') or []
-        elif isinstance(payload, list):
+        if root == '{':
+            for key, value in _stream(path, ijson.kvitems, ''):
+                if key == 'universities':
+                    universities = value or []
+                elif key == 'colleges':
+                    colleges = value or []
+                elif key == 'programs':
+                    programs = value or []
+                elif key == 'courses':
+                    courses = value or []
+        else:
+            records = _stream(path, ijson.items, 'item')
+            sample = next(records, None)
             # Detect Django dumpdata format: list of {model, pk, fields}
-            is_dumpdata = all(isinstance(x, dict) and 'model' in x and 'fields' in x for x in payload) if payload else False
+            is_dumpdata = isinstance(sample, dict) and 'model' in sample and 'fields' in sample
             if is_dumpdata:
-                # First, collect legacy objects by model
+                # First pass: collect the small lookup tables by model. Course
+                # records are skipped here and resolved on a second pass below.
                 legacy_colleges = {}
                 legacy_programs = {}
                 legacy_academic_years = {}
-                legacy_courses = []
-
-                for item in payload:
-                    model_name = item.get('model') or ''
-                    fields = item.get('fields') or {}
-                    pk = item.get('pk')
-                    if 'college' in model_name:
-                        # e.g., {name: "CoET"}
-                        legacy_colleges[pk] = (fields.get('name') or '').strip()
-                    elif 'program' in model_name and 'academic' not in model_name:
-                        legacy_programs[pk] = {
-                            'name': (fields.get('name') or '').strip(),
-                            'college_pk': fields.get('college'),
-                            'duration': fields.get('duration') or fields.get('years') or 4,
-                        }
-                    elif 'academicyear' in model_name or ('academic' in model_name and 'year' in model_name):
-                        legacy_academic_years[pk] = {
-                            'program_pk': fields.get('program'),
-                            'year': fields.get('year') or fields.get('level') or 1,
-                        }
-                    elif 'course' in model_name:
-                        legacy_courses.append({
-                            'academic_year_pk': fields.get('academic_year'),
-                            'code': (fields.get('code') or '').strip(),
-                            'name': (fields.get('name') or '').strip(),
-                            'credit_hours': fields.get('credit_hours') or fields.get('credits') or fields.get('units'),
-                            'semester': fields.get('semester') or fields.get('sem') or 1,
-                            'optional': fields.get('optional') or fields.get('elective') or False,
-                        })
+
+                def add_college(pk, fields):
+                    # e.g., {name: "CoET"}
+                    legacy_colleges[pk] = (fields.get('name') or '').strip()
+
+                def add_program(pk, fields):
+                    legacy_programs[pk] = {
+                        'name': (fields.get('name') or '').strip(),
+                        'college_pk': fields.get('college'),
+                        'duration': fields.get('duration') or fields.get('years') or 4,
+                    }
+
+                def add_academic_year(pk, fields):
+                    legacy_academic_years[pk] = {
+                        'program_pk': fields.get('program'),
+                        'year': fields.get('year') or fields.get('level') or 1,
+                    }
+
+                handlers = {
+                    'college': add_college,
+                    'program': add_program,
+                    'academic_year': add_academic_year,
+                }
+                for item in itertools.chain([sample], records):
+                    if not isinstance(item, dict):
+                        continue
+                    handler = handlers.get(legacy_model_kind(item.get('model') or ''))
+                    if handler is not None:
+                        handler(item.get('pk'), item.get('fields') or {})
 
                 # Build flat colleges list
                 colleges = [{'name': cname} for cname in legacy_colleges.values() if cname]
@@ -98,43 +304,38 @@ class Command(BaseCommand):
                         'duration': p.get('duration') or 4,
                     })
 
-                # Build flat courses list by resolving through academic_year → program → college
-                courses = []
-                for c in legacy_courses:
-                    ay = legacy_academic_years.get(c.get('academic_year_pk')) or {}
+                def resolve_legacy_course(fields):
+                    # Resolve through academic_year → program → college and
+                    # normalize credits, semester and year to ints
+                    ay = legacy_academic_years.get(fields.get('academic_year')) or {}
                     prog = legacy_programs.get(ay.get('program_pk')) or {}
                     college_name = legacy_colleges.get(prog.get('college_pk'))
-                    # Normalize credits and semester to ints
-                    ch_val = c.get('credit_hours') or 3
-                    try:
-                        credits_int = int(decimal.Decimal(str(ch_val)))
-                    except Exception:
-                        credits_int = 3
-                    sem_raw = c.get('semester')
-                    if isinstance(sem_raw, str):
-                        digits = ''.join([ch for ch in sem_raw if ch.isdigit()])
-                        semester_int = int(digits) if digits else 1
-                    else:
-                        try:
-                            semester_int = int(sem_raw)
-                        except Exception:
-                            semester_int = 1
+                    credit_hours = fields.get('credit_hours') or fields.get('credits') or fields.get('units')
                     try:
                         year_int = int(ay.get('year') or 1)
                     except Exception:
                         year_int = 1
-                    courses.append({
+                    optional = fields.get('optional') or fields.get('elective') or False
+                    return {
                         'program_name': prog.get('name') or '',
                         'college_name': college_name or '',
-                        'code': c.get('code') or '',
-                        'name': c.get('name') or '',
-                        'credits': credits_int,
-                        'semester': semester_int,
+                        'code': (fields.get('code') or '').strip(),
+                        'name': (fields.get('name') or '').strip(),
+                        'credits': to_credits(credit_hours or 3),
+                        'semester': to_semester(fields.get('semester') or fields.get('sem') or 1),
                         'year': year_int,
-                        'type': 'elective' if bool(c.get('optional')) else 'core',
-                    })
+                        'type': 'elective' if bool(optional) else 'core',
+                    }
+
+                # Second pass: re-stream the file and yield resolved courses
+                # lazily, so no intermediate list of legacy courses is kept.
+                courses = (
+                    resolve_legacy_course(item.get('fields') or {})
+                    for item in _stream(path, ijson.items, 'item')
+                    if isinstance(item, dict) and legacy_model_kind(item.get('model') or '') == 'course'
+                )
             else:
-                sample = payload[0] if payload else {}
+                payload = [sample, *records] if sample is not None else []
                 sample_keys = set(sample.keys()) if isinstance(sample, dict) else set()
                 # Detect UDSM course export (previous project) by presence of academic_year or credit_hours
                 if 'academic_year' in sample_keys or 'credit_hours' in sample_keys:
@@ -165,12 +366,8 @@ class Command(BaseCommand):
             courses = target_uni_block.get('courses') or courses
 
             # Also gather programs/courses from each college if provided
-            nested_programs = []
-            nested_courses = []
-            for c in colleges or []:
-                nested_programs.extend(c.get('programs') or [])
-                for p in c.get('programs') or []:
-                    nested_courses.extend(p.get('courses') or [])
+            nested_programs = list(itertools.chain.from_iterable(c.get('programs') or [] for c in colleges or []))
+            nested_courses = list(itertools.chain.from_iterable(p.get('courses') or [] for p in nested_programs))
             # Prefer explicit lists if present, else use nested aggregate
             if not programs:
                 programs = nested_programs
@@ -184,107 +381,121 @@ class Command(BaseCommand):
                 defaults={"country": country},
             )
 
-            # Build quick indexes by normalized names to map relationships
-            def norm(value):
-                if value is None:
-                    return ''
-                return slugify(str(value))
-
-            # Helper: infer college from program name using UDSM patterns
-            def infer_college_from_program(program_name: str) -> str:
-                if not program_name:
-                    return 'College of Science and Technology'
-                patterns = {
-                    'COET': 'College of Engineering and Technology',
-                    'COICT': 'College of Information and Communication Technologies',
-                    'COBASS': 'College of Business and Social Sciences',
-                    'COHAS': 'College of Health and Allied Sciences',
-                    'COST': 'College of Science and Technology',
-                    'COA': 'College of Agriculture',
-                    'COED': 'College of Education',
-                    'COMREC': 'College of Natural and Applied Sciences',
-                }
-                upper = program_name.upper()
-                for code, college_name in patterns.items():
-                    if code in upper:
-                        return college_name
-                words = program_name.split()
-                if len(words) >= 3:
-                    for i in range(len(words)):
-                        if words[i].lower() in ['in', 'of'] and i + 1 < len(words):
-                            subject = ' '.join(words[i+1:])
-                            subj = subject.lower()
-                            if 'engineering' in subj:
-                                return 'College of Engineering and Technology'
-                            if 'science' in subj:
-                                return 'College of Science and Technology'
-                            if 'business' in subj:
-                                return 'College of Business and Social Sciences'
-                            if 'education' in subj:
-                                return 'College of Education'
-                            if 'agriculture' in subj:
-                                return 'College of Agriculture'
-                            if 'health' in subj:
-                                return 'College of Health and Allied Sciences'
-                return 'College of Science and Technology'
+            # Colleges and programs are tracked by primary key only; the course
+            # phase needs nothing else, so no model instances are kept around.
+            def resolve_colleges(names):
+                """Map each name to its College id under the university, creating
+                the missing ones with one SELECT and one bulk INSERT."""
+                names = list(dict.fromkeys(n for n in names if n))
+                found = dict(
+                    College.objects.filter(university=university, name__in=names)
+                    .values_list('name', 'id')
+                    .iterator(chunk_size=500)
+                )
+                missing = [College(university=university, name=n) for n in names if n not in found]
+                College.objects.bulk_create(missing)
+                found.update((c.name, c.pk) for c in missing)
+                return found
 
             # Upsert Colleges
+            college_names = [(c.get('name') or '').strip() for c in colleges]
+            resolved_colleges = resolve_colleges(college_names)
             name_to_college = {}
-            for c in colleges:
-                name = (c.get('name') or '').strip()
-                if not name:
-                    continue
-                college, _ = College.objects.get_or_create(
-                    university=university,
-                    name=name,
-                    defaults={},
-                )
-                name_to_college[norm(name)] = college
+            for name in college_names:
+                if name:
+                    name_to_college[norm(name)] = resolved_colleges[name]
 
             # Upsert Programs
-            program_key_to_program = {}
+            program_rows = []
             for p in programs:
                 program_name = (p.get('name') or '').strip()
                 if not program_name:
                     continue
-
-                # Determine college for program
                 college_name = (p.get('college') or p.get('college_name') or p.get('faculty') or '').strip()
-                college = None
+                duration = int(p.get('duration') or p.get('years') or 4)
+                program_rows.append((program_name, college_name, duration))
+
+            # Create colleges referenced only by programs in the same single pass
+            extra_college_names = [
+                college_name for _, college_name, _ in program_rows
+                if college_name and norm(college_name) not in name_to_college
+            ]
+            for name, college_id in resolve_colleges(extra_college_names).items():
+                name_to_college.setdefault(norm(name), college_id)
+
+            wanted_programs = {}
+            # Colleges known at each program row: the declared ones plus those
+            # named by earlier rows, so the fallback below sees the same set as
+            # when every row created its college on the spot
+            seen_college_keys = dict.fromkeys(norm(name) for name in college_names if name)
+            for program_name, college_name, duration in program_rows:
+                # Determine college for program
                 if college_name:
-                    college = name_to_college.get(norm(college_name))
-                    if college is None:
-                        college, _ = College.objects.get_or_create(
-                            university=university,
-                            name=college_name,
-                            defaults={},
-                        )
-                        name_to_college[norm(college_name)] = college
-                else:
+                    college_key = norm(college_name)
+                    seen_college_keys[college_key] = None
+                elif len(seen_college_keys) == 1:
                     # Fallback: if only one college exists, attach to it
-                    if len(name_to_college) == 1:
-                        college = list(name_to_college.values())[0]
-                    else:
-                        # Skip program without resolvable college
-                        self.stdout.write(self.style.WARNING(f"Skipped program without college: {program_name}"))
-                        continue
-
-                duration = p.get('duration') or p.get('years') or 4
-                program, _ = Program.objects.get_or_create(
-                    college=college,
-                    name=program_name,
-                    defaults={"duration": int(duration)},
-                )
-                # Update duration if changed
-                if program.duration != int(duration):
-                    program.duration = int(duration)
-                    program.save(update_fields=['duration'])
-
-                program_key_to_program[(norm(college.name), norm(program_name))] = program
+                    college_key = next(iter(seen_college_keys))
+                else:
+                    # Skip program without resolvable college
+                    self.stdout.write(self.style.WARNING(f"Skipped program without college: {program_name}"))
+                    continue
+                college_id = name_to_college[college_key]
+                wanted_programs[(college_id, program_name)] = (college_key, duration)
+
+            existing_programs = {
+                (college_id, name): (program_id, duration)
+                for program_id, college_id, name, duration in Program.objects.filter(
+                    college_id__in={college_id for college_id, _ in wanted_programs},
+                    name__in={name for _, name in wanted_programs},
+                ).values_list('id', 'college_id', 'name', 'duration').iterator(chunk_size=500)
+            }
+            new_programs = []
+            changed_programs = []
+            now = timezone.now()
+            program_key_to_program = {}
+            for (college_id, program_name), (college_key, duration) in wanted_programs.items():
+                existing = existing_programs.get((college_id, program_name))
+                if existing is None:
+                    program = Program(college_id=college_id, name=program_name, duration=duration)
+                    new_programs.append(program)
+                    program_id = program.pk
+                else:
+                    program_id, existing_duration = existing
+                    if existing_duration != duration:
+                        # Update duration if changed
+                        changed_programs.append(Program(id=program_id, duration=duration, updated_at=now))
+                program_key_to_program[(college_key, norm(program_name))] = program_id
+            Program.objects.bulk_create(new_programs)
+            Program.objects.bulk_update(changed_programs, ['duration', 'updated_at'])
+
+            # Reverse index for the course loop's "unique program name" fallback
+            programs_by_name = defaultdict(list)
+            for (_, norm_name), program_id in program_key_to_program.items():
+                programs_by_name[norm_name].append(program_id)
+
+            # Upsert Courses (flat course lists with explicit mapping).
+            # Incoming rows are collected by (program, code) as signature
+            # tuples in COURSE_UPDATE_FIELDS order, so a later duplicate row
+            # wins, then diffed against the existing rows in one query and
+            # written with a single insert + bulk_update per changed-field set.
+            pending = {}
+
+            @functools.lru_cache(maxsize=None)
+            def find_program(program_name, college_name):
+                # Courses repeat the same (program, college) pair many times;
+                # resolve each pair once instead of on every row.
+                if college_name and program_name:
+                    program_id = program_key_to_program.get((norm(college_name), norm(program_name)))
+                    if program_id is not None:
+                        return program_id
+                if program_name:
+                    # Try any program with matching name (if unique under the university)
+                    candidates = programs_by_name.get(norm(program_name), ())
+                    if len(candidates) == 1:
+                        return candidates[0]
+                return None
 
-            # Upsert Courses (flat course lists with explicit mapping)
-            created_courses = 0
-            updated_courses = 0
             skipped_courses = 0
             for c in courses:
                 code = (c.get('code') or c.get('course_code') or '').strip()
@@ -297,103 +508,36 @@ class Command(BaseCommand):
                 program_name = (c.get('program') or c.get('program_name') or '').strip()
                 college_name = (c.get('college') or c.get('college_name') or '').strip()
 
-                program = None
-                key = None
-                if college_name and program_name:
-                    key = (norm(college_name), norm(program_name))
-                    program = program_key_to_program.get(key)
-                if program is None and program_name:
-                    # Try any program with matching name (if unique under the university)
-                    candidates = [p for k, p in program_key_to_program.items() if k[1] == norm(program_name)]
-                    if len(candidates) == 1:
-                        program = candidates[0]
-                if program is None:
+                program_id = find_program(program_name, college_name)
+                if program_id is None:
                     skipped_courses += 1
                     continue
 
                 credits = c.get('credits') or c.get('credit') or c.get('units') or 3
-                course_type = (c.get('type') or c.get('category') or 'core').lower()
-                if course_type not in {'core', 'elective'}:
-                    course_type = 'core'
+                course_type = to_course_type(c.get('type') or c.get('category'))
                 semester = int(c.get('semester') or c.get('sem') or 1)
                 year = int(c.get('year') or c.get('level') or 1)
 
-                obj, created = Course.objects.get_or_create(
-                    program=program,
-                    code=code,
-                    defaults={
-                        'name': name,
-                        'credits': int(credits),
-                        'type': course_type,
-                        'semester': semester,
-                        'year': year,
-                    }
-                )
-                if created:
-                    created_courses += 1
-                else:
-                    # Update only if fields changed
-                    changed = False
-                    if obj.name != name:
-                        obj.name = name
-                        changed = True
-                    if obj.credits != int(credits):
-                        obj.credits = int(credits)
-                        changed = True
-                    if obj.type != course_type:
-                        obj.type = course_type
-                        changed = True
-                    if obj.semester != semester:
-                        obj.semester = semester
-                        changed = True
-                    if obj.year != year:
-                        obj.year = year
-                        changed = True
-                    if changed:
-                        obj.save()
-                        updated_courses += 1
+                pending[(program_id, code)] = (name, int(credits), course_type, semester, year)
 
             # Upsert from UDSM-style course export (list of course records with academic_year and program)
             if udsm_course_items:
                 # Group by (program_name, year)
-                grouped = {}
+                grouped = defaultdict(list)
                 for item in udsm_course_items:
-                    prog_name = ''
-                    yr = None
-                    ay = item.get('academic_year')
-                    if isinstance(ay, dict):
-                        # academic_year may have nested program
-                        prog = ay.get('program')
-                        if isinstance(prog, dict):
-                            prog_name = (prog.get('name') or '').strip()
-                        else:
-                            prog_name = str(prog or '').strip()
-                        yr = ay.get('year') or ay.get('level') or item.get('year')
-                    else:
-                        prog_name = (item.get('program_name') or item.get('program') or '').strip()
-                        yr = item.get('year') or item.get('level')
-                    try:
-                        yr_int = int(str(yr)[-1]) if isinstance(yr, str) else int(yr)
-                    except Exception:
-                        yr_int = 1
-                    key = (prog_name, yr_int)
-                    grouped.setdefault(key, []).append(item)
+                    grouped[udsm_group_key(item)].append(item)
 
                 for (program_name, year_val), items in grouped.items():
                     if not program_name:
                         continue
                     college_name = infer_college_from_program(program_name)
-                    college = name_to_college.get(norm(college_name))
-                    if college is None:
-                        college, _ = College.objects.get_or_create(
-                            university=university,
-                            name=college_name,
-                            defaults={},
-                        )
-                        name_to_college[norm(college_name)] = college
+                    college_id = name_to_college.get(norm(college_name))
+                    if college_id is None:
+                        college_id = resolve_colleges([college_name])[college_name]
+                        name_to_college[norm(college_name)] = college_id
 
                     program, _ = Program.objects.get_or_create(
-                        college=college,
+                        college_id=college_id,
                         name=program_name,
                         defaults={"duration": 4},
                     )
@@ -405,54 +549,47 @@ class Command(BaseCommand):
                             skipped_courses += 1
                             continue
                         # credits from credit_hours/units
-                        ch = item.get('credit_hours') or item.get('credits') or item.get('units') or 3
-                        try:
-                            credits_int = int(decimal.Decimal(str(ch)))
-                        except Exception:
-                            credits_int = 3
-                        sem_raw = item.get('semester') or item.get('sem') or 1
-                        if isinstance(sem_raw, str):
-                            sem = ''.join([ch for ch in sem_raw if ch.isdigit()])
-                            semester_val = int(sem) if sem else 1
-                        else:
-                            semester_val = int(sem_raw)
-                        course_type = (item.get('type') or item.get('category') or 'core').lower()
-                        if course_type not in {'core', 'elective'}:
-                            course_type = 'core'
-
-                        obj, created = Course.objects.get_or_create(
-                            program=program,
-                            code=code,
-                            defaults={
-                                'name': title,
-                                'credits': credits_int,
-                                'type': course_type,
-                                'semester': semester_val,
-                                'year': int(year_val),
-                            }
-                        )
-                        if created:
-                            created_courses += 1
-                        else:
-                            changed = False
-                            if obj.name != title:
-                                obj.name = title
-                                changed = True
-                            if obj.credits != credits_int:
-                                obj.credits = credits_int
-                                changed = True
-                            if obj.type != course_type:
-                                obj.type = course_type
-                                changed = True
-                            if obj.semester != semester_val:
-                                obj.semester = semester_val
-                                changed = True
-                            if obj.year != int(year_val):
-                                obj.year = int(year_val)
-                                changed = True
-                            if changed:
-                                obj.save()
-                                updated_courses += 1
+                        credits_int = to_credits(item.get('credit_hours') or item.get('credits') or item.get('units') or 3)
+                        semester_val = to_semester(item.get('semester') or item.get('sem') or 1)
+                        course_type = to_course_type(item.get('type') or item.get('category'))
+
+                        pending[(program.pk, code)] = (title, credits_int, course_type, semester_val, int(year_val))
+
+            # Existing rows are loaded as (id, signature) tuples in the same
+            # field order, so an unchanged row costs a single tuple compare
+            existing_courses = {
+                (program_id, code): (course_id, tuple(signature))
+                for course_id, program_id, code, *signature in Course.objects.filter(
+                    program_id__in={program_id for program_id, _ in pending}
+                ).values_list('id', 'program_id', 'code', *COURSE_UPDATE_FIELDS)
+            }
+            to_create = []
+            # Changed rows grouped by which columns differ, so each UPDATE
+            # only rewrites (and builds CASE expressions for) those columns
+            to_update = defaultdict(list)
+            for (program_id, code), signature in pending.items():
+                existing = existing_courses.get((program_id, code))
+                values = dict(zip(COURSE_UPDATE_FIELDS, signature))
+                if existing is None:
+                    to_create.append(Course(program_id=program_id, code=code, **values))
+                    continue
+                course_id, existing_signature = existing
+                if existing_signature == signature:
+                    continue
+                changed_fields = tuple(
+                    field for field, old, new in zip(COURSE_UPDATE_FIELDS, existing_signature, signature)
+                    if old != new
+                )
+                # bulk_update bypasses save(), so auto_now is applied here
+                to_update[changed_fields].append(Course(id=course_id, updated_at=now, **values))
+
+            insert_courses(to_create)
+            for changed_fields, objs in to_update.items():
+                Course.objects.bulk_update(objs, [*changed_fields, 'updated_at'], batch_size=COURSE_BATCH_SIZE)
+            created_courses = len(to_create)
+            updated_courses = sum(len(objs) for objs in to_update.values())
+            # Colleges/programs went through bulk_create/bulk_update, which send no signals
+            invalidate_catalogue()
 
         self.stdout.write(self.style.SUCCESS(
             f"Imported data for '{university_name}'. Courses: +{created_courses} created, {updated_courses} updated, {skipped_courses} skipped."
@@ -1,107 +1,142 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from api.models import University, College, Program, Course
+from api.signals import invalidate_catalogue
+
+
+# Courses for the Computer Science Program
+CS_COURSES = (
+    {"code": "CS101", "name": "Introduction to Programming", "credits": 3, "type": "core", "semester": 1, "year": 1},
+    {"code": "CS102", "name": "Data Structures and Algorithms", "credits": 3, "type": "core", "semester": 2, "year": 1},
+    {"code": "CS201", "name": "Object-Oriented Programming", "credits": 3, "type": "core", "semester": 1, "year": 2},
+    {"code": "CS202", "name": "Database Systems", "credits": 3, "type": "core", "semester": 2, "year": 2},
+    {"code": "CS301", "name": "Software Engineering", "credits": 3, "type": "core", "semester": 1, "year": 3},
+    {"code": "CS302", "name": "Computer Networks", "credits": 3, "type": "core", "semester": 2, "year": 3},
+    {"code": "CS401", "name": "Machine Learning", "credits": 3, "type": "elective", "semester": 1, "year": 4},
+    {"code": "CS402", "name": "Final Year Project", "credits": 6, "type": "core", "semester": 2, "year": 4},
+)
+
+# Courses for the Software Engineering Program
+SE_COURSES = (
+    {"code": "SE101", "name": "Programming Fundamentals", "credits": 3, "type": "core", "semester": 1, "year": 1},
+    {"code": "SE102", "name": "Web Development", "credits": 3, "type": "core", "semester": 2, "year": 1},
+    {"code": "SE201", "name": "Software Design Patterns", "credits": 3, "type": "core", "semester": 1, "year": 2},
+    {"code": "SE202", "name": "Mobile App Development", "credits": 3, "type": "core", "semester": 2, "year": 2},
+    {"code": "SE301", "name": "DevOps and Cloud Computing", "credits": 3, "type": "core", "semester": 1, "year": 3},
+    {"code": "SE302", "name": "Software Testing", "credits": 3, "type": "core", "semester": 2, "year": 3},
+    {"code": "SE401", "name": "Enterprise Software Development", "credits": 3, "type": "core", "semester": 1, "year": 4},
+    {"code": "SE402", "name": "Capstone Project", "credits": 6, "type": "core", "semester": 2, "year": 4},
+)
+
+# Courses for the Information Technology Program
+IT_COURSES = (
+    {"code": "IT101", "name": "Introduction to IT", "credits": 3, "type": "core", "semester": 1, "year": 1},
+    {"code": "IT102", "name": "System Administration", "credits": 3, "type": "core", "semester": 2, "year": 1},
+    {"code": "IT201", "name": "Network Security", "credits": 3, "type": "core", "semester": 1, "year": 2},
+    {"code": "IT202", "name": "Database Management", "credits": 3, "type": "core", "semester": 2, "year": 2},
+    {"code": "IT301", "name": "Cybersecurity", "credits": 3, "type": "core", "semester": 1, "year": 3},
+    {"code": "IT302", "name": "Cloud Computing", "credits": 3, "type": "core", "semester": 2, "year": 3},
+    {"code": "IT401", "name": "IT Project Management", "credits": 3, "type": "core", "semester": 1, "year": 4},
+    {"code": "IT402", "name": "IT Internship", "credits": 6, "type": "core", "semester": 2, "year": 4},
+)
+
+
+def upsert(model, objs, unique_fields, update_fields):
+    """
+    Insert objs in one statement, updating rows that already exist on
+    unique_fields, then point every object at the primary key of its stored
+    row so children built from it reference the surviving row on re-runs.
+    """
+    model.objects.bulk_create(
+        objs,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+    attnames = [model._meta.get_field(name).attname for name in unique_fields]
+    stored = model.objects.filter(**{
+        f'{attname}__in': {getattr(obj, attname) for obj in objs} for attname in attnames
+    }).values_list(*attnames, 'pk')
+    pks = {tuple(row[:-1]): row[-1] for row in stored}
+    for obj in objs:
+        obj.pk = pks[tuple(getattr(obj, attname) for attname in attnames)]
 
 
 class Command(BaseCommand):
-    help = 'Populate database with sample academic data'
+    help = 'Populate database with sample academic data (safe to re-run)'
 
+    @transaction.atomic
     def handle(self, *args, **options):
         # Create Universities
-        university1 = University.objects.create(
+        university1 = University(
             name="University of Technology",
             country="Nigeria"
         )
         
-        university2 = University.objects.create(
+        university2 = University(
             name="Federal University of Science and Technology",
             country="Nigeria"
         )
         
+        upsert(University, [university1, university2], ['name'], ['country', 'updated_at'])
+        
         # Create Colleges
-        college1 = College.objects.create(
+        college1 = College(
             name="College of Engineering and Technology",
             university=university1
         )
         
-        college2 = College.objects.create(
+        college2 = College(
             name="College of Computing and Information Technology",
             university=university1
         )
         
-        college3 = College.objects.create(
+        college3 = College(
             name="College of Engineering",
             university=university2
         )
         
+        upsert(College, [college1, college2, college3], ['university', 'name'], ['updated_at'])
+        
         # Create Programs
-        program1 = Program.objects.create(
+        program1 = Program(
             name="Bachelor of Science in Computer Science",
             college=college1,
             duration=4
         )
         
-        program2 = Program.objects.create(
+        program2 = Program(
             name="Bachelor of Engineering in Software Engineering",
             college=college2,
             duration=4
         )
         
-        program3 = Program.objects.create(
+        program3 = Program(
             name="Bachelor of Science in Information Technology",
             college=college2,
             duration=4
         )
         
-        program4 = Program.objects.create(
+        program4 = Program(
             name="Bachelor of Engineering in Computer Engineering",
             college=college3,
             duration=5
         )
         
-        # Create Courses for Computer Science Program
-        courses_cs = [
-            {"code": "CS101", "name": "Introduction to Programming", "credits": 3, "type": "core", "semester": 1, "year": 1},
-            {"code": "CS102", "name": "Data Structures and Algorithms", "credits": 3, "type": "core", "semester": 2, "year": 1},
-            {"code": "CS201", "name": "Object-Oriented Programming", "credits": 3, "type": "core", "semester": 1, "year": 2},
-            {"code": "CS202", "name": "Database Systems", "credits": 3, "type": "core", "semester": 2, "year": 2},
-            {"code": "CS301", "name": "Software Engineering", "credits": 3, "type": "core", "semester": 1, "year": 3},
-            {"code": "CS302", "name": "Computer Networks", "credits": 3, "type": "core", "semester": 2, "year": 3},
-            {"code": "CS401", "name": "Machine Learning", "credits": 3, "type": "elective", "semester": 1, "year": 4},
-            {"code": "CS402", "name": "Final Year Project", "credits": 6, "type": "core", "semester": 2, "year": 4},
-        ]
-        
-        for course_data in courses_cs:
-            Course.objects.create(program=program1, **course_data)
-        
-        # Create Courses for Software Engineering Program
-        courses_se = [
-            {"code": "SE101", "name": "Programming Fundamentals", "credits": 3, "type": "core", "semester": 1, "year": 1},
-            {"code": "SE102", "name": "Web Development", "credits": 3, "type": "core", "semester": 2, "year": 1},
-            {"code": "SE201", "name": "Software Design Patterns", "credits": 3, "type": "core", "semester": 1, "year": 2},
-            {"code": "SE202", "name": "Mobile App Development", "credits": 3, "type": "core", "semester": 2, "year": 2},
-            {"code": "SE301", "name": "DevOps and Cloud Computing", "credits": 3, "type": "core", "semester": 1, "year": 3},
-            {"code": "SE302", "name": "Software Testing", "credits": 3, "type": "core", "semester": 2, "year": 3},
-            {"code": "SE401", "name": "Enterprise Software Development", "credits": 3, "type": "core", "semester": 1, "year": 4},
-            {"code": "SE402", "name": "Capstone Project", "credits": 6, "type": "core", "semester": 2, "year": 4},
-        ]
+        upsert(Program, [program1, program2, program3, program4], ['college', 'name'], ['duration', 'updated_at'])
         
-        for course_data in courses_se:
-            Course.objects.create(program=program2, **course_data)
-        
-        # Create Courses for Information Technology Program
-        courses_it = [
-            {"code": "IT101", "name": "Introduction to IT", "credits": 3, "type": "core", "semester": 1, "year": 1},
-            {"code": "IT102", "name": "System Administration", "credits": 3, "type": "core", "semester": 2, "year": 1},
-            {"code": "IT201", "name": "Network Security", "credits": 3, "type": "core", "semester": 1, "year": 2},
-            {"code": "IT202", "name": "Database Management", "credits": 3, "type": "core", "semester": 2, "year": 2},
-            {"code": "IT301", "name": "Cybersecurity", "credits": 3, "type": "core", "semester": 1, "year": 3},
-            {"code": "IT302", "name": "Cloud Computing", "credits": 3, "type": "core", "semester": 2, "year": 3},
-            {"code": "IT401", "name": "IT Project Management", "credits": 3, "type": "core", "semester": 1, "year": 4},
-            {"code": "IT402", "name": "IT Internship", "credits": 6, "type": "core", "semester": 2, "year": 4},
-        ]
-        
-        for course_data in courses_it:
-            Course.objects.create(program=program3, **course_data)
+        # Upsert all courses in one statement
+        Course.objects.bulk_create(
+            [Course(program=program1, **course_data) for course_data in CS_COURSES]
+            + [Course(program=program2, **course_data) for course_data in SE_COURSES]
+            + [Course(program=program3, **course_data) for course_data in IT_COURSES],
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['program', 'code'],
+            update_fields=['name', 'credits', 'type', 'semester', 'year', 'updated_at'],
+        )
+        invalidate_catalogue()
         
         self.stdout.write(
             self.style.SUCCESS('Successfully populated database with sample data')
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_student_has_courses"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="course",
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["code"], name="api_course_code_2921ed_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="course",
+            constraint=models.UniqueConstraint(
+                fields=("program", "code"), name="uniq_course_program_code"
+            ),
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:52
+
+from django.db import migrations, models
+
+
+def merge_duplicates(model, key, repoint):
+    """
+    Keep the oldest `model` row for each `key` and delete the later copies,
+    handing each one to repoint(duplicate_pk, kept_pk) first.
+    """
+    kept = {}
+    for pk, *values in model.objects.order_by("created_at", "pk").values_list("pk", *key):
+        values = tuple(values)
+        if values in kept:
+            repoint(pk, kept[values])
+            model.objects.filter(pk=pk).delete()
+        else:
+            kept[values] = pk
+
+
+def merge_duplicate_catalogue(apps, schema_editor):
+    # Running populate_data twice used to insert every university, college
+    # and program again; fold the copies before their keys become unique
+    University = apps.get_model("api", "University")
+    College = apps.get_model("api", "College")
+    Program = apps.get_model("api", "Program")
+    Course = apps.get_model("api", "Course")
+    Student = apps.get_model("api", "Student")
+    StudentCourse = apps.get_model("api", "StudentCourse")
+    merged_courses = {}
+
+    def repoint_university(duplicate, kept):
+        College.objects.filter(university_id=duplicate).update(university_id=kept)
+        Student.objects.filter(university_id=duplicate).update(university_id=kept)
+
+    def repoint_college(duplicate, kept):
+        Program.objects.filter(college_id=duplicate).update(college_id=kept)
+        Student.objects.filter(college_id=duplicate).update(college_id=kept)
+
+    def repoint_program(duplicate, kept):
+        # A code the kept program already has is the same course twice
+        kept_codes = dict(Course.objects.filter(program_id=kept).values_list("code", "pk"))
+        for pk, code in Course.objects.filter(program_id=duplicate).values_list("pk", "code"):
+            if code in kept_codes:
+                merged_courses[str(pk)] = str(kept_codes[code])
+                Course.objects.filter(pk=pk).delete()
+        Course.objects.filter(program_id=duplicate).update(program_id=kept)
+        Student.objects.filter(program_id=duplicate).update(program_id=kept)
+
+    merge_duplicates(University, ("name",), repoint_university)
+    merge_duplicates(College, ("university_id", "name"), repoint_college)
+    merge_duplicates(Program, ("college_id", "name"), repoint_program)
+
+    # Saved course lists name courses by id; point them at the kept copies
+    if merged_courses:
+        for student_course in StudentCourse.objects.all():
+            courses, seen = [], set()
+            for course in student_course.courses or []:
+                course_id = merged_courses.get(str(course.get("id")), course.get("id"))
+                if course_id not in seen:
+                    seen.add(course_id)
+                    courses.append({**course, "id": course_id})
+            if courses != student_course.courses:
+                student_course.courses = courses
+                student_course.save(update_fields=["courses"])
+
+    # PostgreSQL defers FK checks to commit, and won't ALTER a table with
+    # checks still pending; run them now
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_alter_course_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_catalogue, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="university",
+            name="name",
+            field=models.CharField(max_length=200, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name="college",
+            constraint=models.UniqueConstraint(
+                fields=("university", "name"), name="uniq_college_university_name"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="program",
+            constraint=models.UniqueConstraint(
+                fields=("college", "name"), name="uniq_program_college_name"
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:53
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_alter_university_name_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="college",
+            name="id",
+            field=models.UUIDField(
+                default=api.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="course",
+            name="id",
+            field=models.UUIDField(
+                default=api.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="program",
+            name="id",
+            field=models.UUIDField(
+                default=api.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="id",
+            field=models.UUIDField(
+                default=api.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="studentcourse",
+            name="id",
+            field=models.UUIDField(
+                default=api.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="university",
+            name="id",
+            field=models.UUIDField(
+                default=api.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=api.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
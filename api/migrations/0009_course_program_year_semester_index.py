@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["program", "year", "semester"],
+                name="api_course_program_b711ea_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:56
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_course_program_year_semester_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="studentcourse",
+            name="courses",
+            field=models.JSONField(
+                blank=True,
+                decoder=api.models.OrjsonDecoder,
+                default=list,
+                encoder=api.models.OrjsonEncoder,
+            ),
+        ),
+    ]
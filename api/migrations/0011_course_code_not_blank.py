@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_studentcourse_orjson"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="course",
+            constraint=models.CheckConstraint(
+                check=models.Q(("code", ""), _negated=True),
+                name="course_code_not_blank",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:59
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_course_code_not_blank"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="student",
+            name="has_courses",
+        ),
+    ]
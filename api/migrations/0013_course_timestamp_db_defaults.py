@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def set_timestamp_defaults(apps, schema_editor):
+    # import_old_data COPYs courses straight into the table; let PostgreSQL
+    # stamp them instead of streaming two timestamps per row
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        'ALTER TABLE "api_course" '
+        'ALTER COLUMN "created_at" SET DEFAULT now(), '
+        'ALTER COLUMN "updated_at" SET DEFAULT now()'
+    )
+
+
+def drop_timestamp_defaults(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        'ALTER TABLE "api_course" '
+        'ALTER COLUMN "created_at" DROP DEFAULT, '
+        'ALTER COLUMN "updated_at" DROP DEFAULT'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_remove_student_has_courses"),
+    ]
+
+    operations = [
+        migrations.RunPython(set_timestamp_defaults, drop_timestamp_defaults),
+    ]
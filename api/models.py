@@ -1,7 +1,26 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+import json
+import os
+import time
 import uuid
 
+import orjson
+
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond timestamp
+    followed by random bits, so new primary keys are appended to the right
+    edge of the index instead of landing on random pages like uuid4.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
 
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -27,7 +46,7 @@ class UserManager(BaseUserManager):
 
 
 class User(AbstractUser):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     email = models.EmailField(unique=True)
     display_name = models.CharField(max_length=100)
     username = models.CharField(max_length=150, unique=True, blank=True, null=True)
@@ -53,8 +72,8 @@ class User(AbstractUser):
 
 
 class University(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    name = models.CharField(max_length=200)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    name = models.CharField(max_length=200, unique=True)
     country = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -64,24 +83,34 @@ class University(models.Model):
 
 
 class College(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=200)
     university = models.ForeignKey(University, on_delete=models.CASCADE, related_name='colleges')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['university', 'name'], name='uniq_college_university_name'),
+        ]
+    
     def __str__(self):
         return f"{self.name} - {self.university.name}"
 
 
 class Program(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=200)
     college = models.ForeignKey(College, on_delete=models.CASCADE, related_name='programs')
     duration = models.IntegerField()  # in years
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['college', 'name'], name='uniq_program_college_name'),
+        ]
+    
     def __str__(self):
         return f"{self.name} - {self.college.name}"
 
@@ -91,7 +120,7 @@ class Course(models.Model):
         ('core', 'Core'),
         ('elective', 'Elective'),
     ]
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     code = models.CharField(max_length=20)
     name = models.CharField(max_length=200)
     credits = models.IntegerField()
@@ -103,14 +132,24 @@ class Course(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        unique_together = ['code', 'program']
+        constraints = [
+            # program first so the index also serves program-scoped filters
+            models.UniqueConstraint(fields=['program', 'code'], name='uniq_course_program_code'),
+            # Enforced by the database so COPY/bulk_create imports are checked too
+            models.CheckConstraint(check=~models.Q(code=''), name='course_code_not_blank'),
+        ]
+        indexes = [
+            models.Index(fields=['code']),
+            # CourseListView: program_id with optional year/semester filters
+            models.Index(fields=['program', 'year', 'semester']),
+        ]
     
     def __str__(self):
         return f"{self.code} - {self.name}"
 
 
 class Student(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='student_profile')
     university = models.ForeignKey(University, on_delete=models.CASCADE, related_name='students')
     college = models.ForeignKey(College, on_delete=models.CASCADE, related_name='students')
@@ -119,58 +158,171 @@ class Student(models.Model):
     semester = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    has_courses = models.BooleanField(default=False,blank=True)
+    
     def __str__(self):
         return f"{self.user.display_name} - {self.program.name}"
 
+    def get_gpa_breakdown(self):
+        """
+        GPA totals plus one entry per graded course, built in a single pass
+        over the stored course list. Reuses a StudentCourse row joined with
+        the student (select_related), otherwise reads just the list.
+        """
+        if Student.student_courses.is_cached(self):
+            student_course = getattr(self, 'student_courses', None)
+            courses = student_course.courses if student_course is not None else []
+        else:
+            courses = StudentCourse.objects.filter(student=self).values_list('courses', flat=True).first()
+        courses = courses or []
+        breakdown = []
+        total_points = 0.0
+        total_credits = 0
+        for course in courses:
+            points = course.get('points')
+            credits = course.get('credits')
+            if not isinstance(points, (int, float)) or not isinstance(credits, (int, float)):
+                continue
+            total_points += points * credits
+            total_credits += credits
+            breakdown.append({
+                'course_id': course.get('id'),
+                'course_code': course.get('code'),
+                'course_name': course.get('name'),
+                'credits': credits,
+                'grade': course.get('grade'),
+                'points': points,
+            })
+        return {
+            'gpa': round(total_points / total_credits, 2) if total_credits else 0.0,
+            'total_credits': total_credits,
+            'total_points': round(total_points, 2),
+            'graded_courses': len(breakdown),
+            'breakdown': breakdown,
+        }
+
+
+
+class OrjsonEncoder(json.JSONEncoder):
+    """
+    JSONField encoder that hands the whole document to orjson, falling back
+    to the stdlib for anything orjson refuses (e.g. non-string keys).
+    """
+
+    def encode(self, o):
+        try:
+            return orjson.dumps(o).decode()
+        except TypeError:
+            return super().encode(o)
+
+
+class OrjsonDecoder(json.JSONDecoder):
+    """JSONField decoder backed by orjson.loads."""
+
+    def decode(self, s, *args, **kwargs):
+        return orjson.loads(s)
 
 
 class StudentCourse(models.Model): 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     student = models.OneToOneField(Student, on_delete=models.CASCADE, related_name='student_courses')
-    courses = models.JSONField(default=list, blank=True)
+    courses = models.JSONField(default=list, blank=True, encoder=OrjsonEncoder, decoder=OrjsonDecoder)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    GRADE_POINTS = {
+        'A': 5.0,
+        'B+': 4.0,
+        'B': 3.0,
+        'C': 2.0,
+        'D': 1.0,
+        'E': 0.0,
+        'F': 0.0,
+    }
     
     def __str__(self):
         return f"{self.student.user.display_name} - {len(self.courses)} courses"
 
-    def save(self, *args, **kwargs):
-        """
-        Ensure the related student's has_courses flag stays in sync with
-        whether there are any courses stored for the student.
-        """
-        super().save(*args, **kwargs)
-        has_any_courses = bool(self.courses)
-        if self.student.has_courses != has_any_courses:
-            self.student.has_courses = has_any_courses
-            # Save only the field that changed to avoid unnecessary writes
-            self.student.save(update_fields=['has_courses'])
-
     def add_course(self, course_data):
         """
         Add a course dict to the JSON list if not already present by id.
         Returns True if added, False if it already existed.
+
+        On PostgreSQL the element is appended in the database with jsonb ||,
+        guarded against duplicates in the same statement, so concurrent adds
+        never overwrite each other and only the new element is sent.
         """
         course_id = str(course_data.get('id')) if course_data.get('id') is not None else None
-        existing_ids = {str(c.get('id')) for c in (self.courses or [])}
-        if course_id and course_id in existing_ids:
+        if course_id and any(str(c.get('id')) == course_id for c in (self.courses or [])):
             return False
-        courses_list = list(self.courses or [])
-        courses_list.append(course_data)
-        self.courses = courses_list
-        self.save()
+        rows = StudentCourse.objects.filter(pk=self.pk)
+        now = timezone.now()
+        if connection.vendor == 'postgresql':
+            if course_id:
+                rows = rows.exclude(courses__contains=[{'id': course_id}])
+            appended = RawSQL('"courses" || %s::jsonb', [orjson.dumps([course_data]).decode()])
+            if not rows.update(courses=appended, updated_at=now):
+                return False
+            self.courses = list(self.courses or []) + [course_data]
+        else:
+            self.courses = list(self.courses or []) + [course_data]
+            rows.update(courses=self.courses, updated_at=now)
+        # Kept in step with the row: student_courses_etag reads it
+        self.updated_at = now
         return True
 
-    def remove_course(self, course_id):
+    def set_grades(self, grades):
+        """
+        Record grades on the stored courses from a {course_id: grade} mapping.
+        Each course's points are looked up once here and stored next to its
+        grade, and the list is written back in a single UPDATE only if some
+        grade actually changed. Returns the number of courses changed.
         """
-        Remove a course from the JSON list by its id. Returns True if removed.
+        grades = {str(course_id): grade for course_id, grade in grades.items()}
+        courses = []
+        changed = 0
+        for course in self.courses or []:
+            course_id = str(course.get('id'))
+            if course_id in grades and course.get('grade') != grades[course_id]:
+                grade = grades[course_id]
+                course = {**course, 'grade': grade, 'points': self.GRADE_POINTS.get(grade)}
+                changed += 1
+            courses.append(course)
+        if changed:
+            self.updated_at = timezone.now()
+            StudentCourse.objects.filter(pk=self.pk).update(courses=courses, updated_at=self.updated_at)
+            self.courses = courses
+        return changed
+
+    @staticmethod
+    def remove_course_from(rows, course_id):
+        """
+        Remove a course by id from the lists in `rows`, a StudentCourse
+        queryset, without loading the instances first. Returns the number of
+        lists that held the course.
+
+        On PostgreSQL the lists are filtered in the database in one UPDATE that
+        only matches rows actually holding the id; elsewhere each list is read
+        and written back.
         """
         target_id = str(course_id)
-        original_len = len(self.courses or [])
-        filtered = [c for c in (self.courses or []) if str(c.get('id')) != target_id]
-        if len(filtered) == original_len:
-            return False
-        self.courses = filtered
-        self.save()
-        return True
+        if connection.vendor == 'postgresql':
+            holds_course = RawSQL(
+                'EXISTS (SELECT 1 FROM jsonb_array_elements("courses") AS c(value) '
+                'WHERE c.value->>\'id\' = %s)',
+                [target_id],
+                output_field=models.BooleanField(),
+            )
+            remaining = RawSQL(
+                'COALESCE((SELECT jsonb_agg(c.value ORDER BY c.position) '
+                'FROM jsonb_array_elements("courses") WITH ORDINALITY AS c(value, position) '
+                'WHERE c.value->>\'id\' IS DISTINCT FROM %s), \'[]\'::jsonb)',
+                [target_id],
+            )
+            return rows.filter(holds_course).update(courses=remaining, updated_at=timezone.now())
+        removed = 0
+        for pk, courses in rows.values_list('pk', 'courses'):
+            filtered = [c for c in (courses or []) if str(c.get('id')) != target_id]
+            if len(filtered) != len(courses or []):
+                StudentCourse.objects.filter(pk=pk).update(courses=filtered, updated_at=timezone.now())
+                removed += 1
+        return removed
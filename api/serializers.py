@@ -1,11 +1,31 @@
+import hmac
+
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import User, University, College, Program, Course, Student, StudentCourse
 
 
+class EagerLoadingMixin:
+    """
+    Serializers declare the relations they read; setup_eager_loading applies
+    them to a queryset so views never serialize with per-row queries.
+    """
+    _SELECT_RELATED = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related(*cls._SELECT_RELATED)
+
+    @classmethod
+    def nested_select_related(cls, field):
+        """This serializer's joins as seen from a parent serializing it under `field`."""
+        return (field, *(f'{field}__{path}' for path in cls._SELECT_RELATED))
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
-    password = serializers.CharField(write_only=True, validators=[validate_password])
+    password = serializers.CharField(write_only=True)
     password_confirm = serializers.CharField(write_only=True)
     
     class Meta:
@@ -13,12 +33,19 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ('email', 'password', 'password_confirm', 'display_name')
     
     def validate(self, attrs):
-        if attrs['password'] != attrs['password_confirm']:
+        # Cheap mismatch check first; the password validators only run for
+        # submissions that could actually succeed, and only on the password
+        # itself since the confirmation leaves validated_data here
+        password_confirm = attrs.pop('password_confirm')
+        if not hmac.compare_digest(attrs['password'].encode(), password_confirm.encode()):
             raise serializers.ValidationError("Passwords don't match")
+        try:
+            validate_password(attrs['password'])
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'password': list(e.messages)})
         return attrs
     
     def create(self, validated_data):
-        validated_data.pop('password_confirm')
         # Set username to email for compatibility
         validated_data['username'] = validated_data['email']
         user = User.objects.create_user(**validated_data)
@@ -51,22 +78,43 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'email', 'display_name')
 
+    def to_representation(self, instance):
+        # register/login echo the user they just saved or authenticated, so
+        # skip binding fields for a three-key payload
+        return {'id': str(instance.id), 'email': instance.email, 'display_name': instance.display_name}
+
 
 class UniversitySerializer(serializers.ModelSerializer):
     class Meta:
         model = University
         fields = ('id', 'name', 'country')
 
+    def to_representation(self, instance):
+        return {'id': str(instance.id), 'name': instance.name, 'country': instance.country}
+
+
+class CollegeSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    _SELECT_RELATED = ('university',)
 
-class CollegeSerializer(serializers.ModelSerializer):
     university_name = serializers.CharField(source='university.name', read_only=True)
     
     class Meta:
         model = College
         fields = ('id', 'name', 'university', 'university_name')
 
+    def to_representation(self, instance):
+        # Reads the joins _SELECT_RELATED declares, see StudentSerializer
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'university': instance.university_id,
+            'university_name': instance.university.name,
+        }
+
+
+class ProgramSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    _SELECT_RELATED = ('college__university',)
 
-class ProgramSerializer(serializers.ModelSerializer):
     college_name = serializers.CharField(source='college.name', read_only=True)
     university_name = serializers.CharField(source='college.university.name', read_only=True)
     
@@ -74,8 +122,20 @@ class ProgramSerializer(serializers.ModelSerializer):
         model = Program
         fields = ('id', 'name', 'college', 'college_name', 'university_name', 'duration')
 
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'college': instance.college_id,
+            'college_name': instance.college.name,
+            'university_name': instance.college.university.name,
+            'duration': instance.duration,
+        }
+
+
+class CourseSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    _SELECT_RELATED = ('program',)
 
-class CourseSerializer(serializers.ModelSerializer):
     program_name = serializers.CharField(source='program.name', read_only=True)
     
     class Meta:
@@ -83,12 +143,26 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = ('id', 'code', 'name', 'credits', 'type', 'semester', 'year', 'program', 'program_name')
 
 
+# Unbound formatter so StudentCourseSerializer never has to build its fields
+TIMESTAMP_FIELD = serializers.DateTimeField(read_only=True)
+
+
 class StudentCourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudentCourse
         fields = ('id', 'courses', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
+    def to_representation(self, instance):
+        # Built in one pass: the course list is already plain JSON, so only the
+        # timestamps need formatting
+        return {
+            'id': str(instance.id),
+            'courses': instance.courses,
+            'created_at': TIMESTAMP_FIELD.to_representation(instance.created_at),
+            'updated_at': TIMESTAMP_FIELD.to_representation(instance.updated_at),
+        }
+
 class CourseDataSerializer(serializers.Serializer):
     id = serializers.CharField()
     code = serializers.CharField()
@@ -103,7 +177,14 @@ class StudentCourseUpdateSerializer(serializers.Serializer):
     courses = CourseDataSerializer(many=True)
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    _SELECT_RELATED = (
+        'university',
+        *CollegeSerializer.nested_select_related('college'),
+        *ProgramSerializer.nested_select_related('program'),
+        'student_courses',
+    )
+
     university = UniversitySerializer(read_only=True)
     college = CollegeSerializer(read_only=True)
     program = ProgramSerializer(read_only=True)
@@ -113,15 +194,44 @@ class StudentSerializer(serializers.ModelSerializer):
         model = Student
         fields = ('id', 'university', 'college', 'program', 'year', 'semester', 'courses', 'has_courses')
 
+    def to_representation(self, instance):
+        # Built by hand like StudentCourseSerializer's: every value is a plain
+        # attribute of the joined rows, so binding and walking the declared
+        # field tree (deep-copied per serializer) would be pure overhead.
+        # has_courses comes from the StudentCourse row the profile query joins
+        try:
+            courses = instance.student_courses.courses
+        except StudentCourse.DoesNotExist:
+            courses = None
+        return {
+            'id': str(instance.id),
+            'university': UniversitySerializer().to_representation(instance.university),
+            'college': CollegeSerializer().to_representation(instance.college),
+            'program': ProgramSerializer().to_representation(instance.program),
+            'year': instance.year,
+            'semester': instance.semester,
+            'courses': courses,
+            'has_courses': bool(courses),
+        }
+
 
 class StudentCreateUpdateSerializer(serializers.ModelSerializer):
+    # Looked up with the joins StudentSerializer renders, so the saved student
+    # can be serialized straight away instead of being read back
+    college = serializers.PrimaryKeyRelatedField(queryset=CollegeSerializer.setup_eager_loading(College.objects))
+    program = serializers.PrimaryKeyRelatedField(queryset=ProgramSerializer.setup_eager_loading(Program.objects))
+
     class Meta:
         model = Student
         fields = ('university', 'college', 'program', 'year', 'semester')
     
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        student = super().create(validated_data)
+        # A new student has no StudentCourse yet; record that instead of
+        # letting StudentSerializer query for it
+        Student.student_courses.related.set_cached_value(student, None)
+        return student
 
 
 class GPABreakdownSerializer(serializers.Serializer):
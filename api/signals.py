@@ -0,0 +1,49 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import University, College, Program, Course
+
+
+# Cached student_profile_options payload; it only depends on the university,
+# college and program tables
+PROFILE_OPTIONS_CACHE_KEY = 'profile_options'
+PROFILE_OPTIONS_CACHE_TIMEOUT = 60 * 60
+
+# The catalogue list endpoints cache one entry per parent/filter, too many to
+# delete one by one, so their keys embed a version that changes instead
+CATALOGUE_VERSION_KEY = 'catalogue_version'
+CATALOGUE_CACHE_TIMEOUT = 60 * 60
+
+
+def catalogue_cache_key(*parts):
+    version = cache.get_or_set(CATALOGUE_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+    return ':'.join(['catalogue', version, *map(str, parts)])
+
+
+def invalidate_catalogue():
+    """
+    Drop the cached profile options and move the catalogue lists to a new
+    version once the current transaction commits, so a concurrent request
+    can't re-cache the rows that are being replaced. bulk_create/bulk_update
+    send no signals; callers using them invoke this directly.
+    """
+    def invalidate():
+        cache.delete(PROFILE_OPTIONS_CACHE_KEY)
+        cache.set(CATALOGUE_VERSION_KEY, uuid.uuid4().hex, None)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=University)
+@receiver(post_save, sender=College)
+@receiver(post_save, sender=Program)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=University)
+@receiver(post_delete, sender=College)
+@receiver(post_delete, sender=Program)
+@receiver(post_delete, sender=Course)
+def academic_structure_changed(sender, **kwargs):
+    invalidate_catalogue()
@@ -1,3 +1,302 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import uuid
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from .management.commands.import_old_data import infer_college_from_program
+from .views import get_access_token_for_user
+from .models import User, University, College, Program, Course, Student, StudentCourse
+
+
+class CatalogueCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email='student@example.com', password='x', display_name='Student')
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.university = University.objects.create(name='UDSM', country='Tanzania')
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_profile_options_follow_catalogue_edits(self):
+        response = self.client.get('/api/students/profile/options/')
+        self.assertEqual([u['name'] for u in response.json()['universities']], ['UDSM'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.university.name = 'University of Dar es Salaam'
+            self.university.save()
+        response = self.client.get('/api/students/profile/options/')
+        self.assertEqual([u['name'] for u in response.json()['universities']], ['University of Dar es Salaam'])
+
+    def test_unchanged_profile_options_revalidate_with_304(self):
+        etag = self.client.get('/api/students/profile/options/')['ETag']
+        response = self.client.get('/api/students/profile/options/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_catalogue_lists_follow_catalogue_edits(self):
+        self.assertEqual(self.client.get('/api/universities/').json()[0]['country'], 'Tanzania')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/universities/').json()[0]['country'], 'Tanzania')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.university.country = 'TZ'
+            self.university.save()
+        self.assertEqual(self.client.get('/api/universities/').json()[0]['country'], 'TZ')
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_unchanged_catalogue_lists_revalidate_without_reading_rows(self):
+        etag = self.client.get('/api/universities/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/universities/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.university.save()
+        response = self.client.get('/api/universities/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_catalogue_lists_are_read_every_time_without_a_shared_cache(self):
+        self.client.get('/api/universities/')
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.client.get('/api/universities/').json()), 1)
+
+
+class InferCollegeTests(SimpleTestCase):
+    CASES = {
+        '': 'College of Science and Technology',
+        'BSc COET Mechanical': 'College of Engineering and Technology',
+        # Codes are tried in COLLEGE_CODES order, not by position
+        'COA and COET joint': 'College of Engineering and Technology',
+        'Bachelor of Science in Civil Engineering': 'College of Engineering and Technology',
+        'Diploma of Education Science': 'College of Science and Technology',
+        'Bachelor of Commerce in Business Education': 'College of Business and Social Sciences',
+        'Bachelor of Arts in Education': 'College of Education',
+        'BSc in Agriculture': 'College of Agriculture',
+        'Master of Public Health': 'College of Health and Allied Sciences',
+        # Too short for the in/of rule, and "of" has to stand alone
+        'of Engineering': 'College of Science and Technology',
+        'Professional Engineering': 'College of Science and Technology',
+    }
+
+    def test_college_inference_keeps_priority_order(self):
+        for program_name, college in self.CASES.items():
+            with self.subTest(program_name=program_name):
+                self.assertEqual(infer_college_from_program(program_name), college)
+
+
+class StudentFixtureMixin:
+    def setUp(self):
+        university = University.objects.create(name='UDSM', country='Tanzania')
+        college = College.objects.create(name='CoICT', university=university)
+        self.program = Program.objects.create(name='BSc in Computer Science', college=college, duration=3)
+        self.user = User.objects.create_user(email='student@example.com', password='x', display_name='Student')
+        self.student = Student.objects.create(
+            user=self.user, university=university, college=college, program=self.program, year=1, semester=1,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class AuthenticationTests(StudentFixtureMixin, TestCase):
+    """StudentJWTAuthentication through simplejwt's own get_user."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_access_token_for_user(self.user)}')
+
+    def test_profile_is_joined_to_the_user_lookup(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/students/gpa/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_library_checks_still_apply(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/api/students/gpa/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'user_inactive')
+
+        self.user.delete()
+        response = self.client.get('/api/students/gpa/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'user_not_found')
+
+
+class GPATests(StudentFixtureMixin, TestCase):
+    def test_breakdown_weights_graded_courses_by_credits(self):
+        StudentCourse.objects.create(student=self.student, courses=[
+            {'id': 'a', 'code': 'CS101', 'credits': 3, 'grade': 'A', 'points': 5.0},
+            {'id': 'b', 'code': 'CS102', 'credits': 1, 'grade': 'C', 'points': 2.0},
+            {'id': 'c', 'code': 'CS103', 'credits': 4},
+        ])
+        response = self.client.get('/api/students/gpa/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['gpa'], 4.25)
+        self.assertEqual(data['total_credits'], 4)
+        self.assertEqual([c['course_id'] for c in data['breakdown']], ['a', 'b'])
+
+    def test_unchanged_course_list_revalidates_with_304(self):
+        StudentCourse.objects.create(student=self.student, courses=[
+            {'id': 'a', 'code': 'CS101', 'credits': 3, 'grade': 'C', 'points': 2.0},
+        ])
+        etag = self.client.get('/api/students/gpa/')['ETag']
+        with mock.patch.object(Student, 'get_gpa_breakdown') as get_gpa_breakdown:
+            response = self.client.get('/api/students/gpa/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        get_gpa_breakdown.assert_not_called()
+
+        self.assertEqual(self.client.post('/api/students/gpa/reset/').status_code, 200)
+        response = self.client.get('/api/students/gpa/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_breakdown_without_a_course_list(self):
+        self.assertEqual(self.student.get_gpa_breakdown()['gpa'], 0.0)
+
+
+class CourseListTests(StudentFixtureMixin, TestCase):
+    def test_non_ascii_digit_filters_are_ignored(self):
+        Course.objects.create(
+            program=self.program, code='CS101', name='Programming', credits=3, type='core', semester=1, year=1,
+        )
+        url = f'/api/programs/{self.program.id}/courses/'
+        for value in ('\u00b2', '\u0663', 'x'):
+            with self.subTest(value=value):
+                response = self.client.get(url, {'year': value})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([c['code'] for c in response.json()], ['CS101'])
+        self.assertEqual(self.client.get(url, {'year': '2'}).json(), [])
+
+
+class StudentCourseListTests(StudentFixtureMixin, TestCase):
+    """add_course/remove_course_from/set_grades on the vendor's own SQL path."""
+
+    def setUp(self):
+        super().setUp()
+        self.student_course = StudentCourse.objects.create(student=self.student, courses=[])
+
+    def stored(self):
+        return StudentCourse.objects.get(pk=self.student_course.pk)
+
+    def stored_ids(self):
+        return [c['id'] for c in self.stored().courses]
+
+    def test_add_course_appends_in_order(self):
+        self.assertTrue(self.student_course.add_course({'id': 'a', 'credits': 3}))
+        self.assertTrue(self.student_course.add_course({'id': 'b', 'credits': 2}))
+        self.assertEqual(self.stored_ids(), ['a', 'b'])
+        self.assertEqual([c['id'] for c in self.student_course.courses], ['a', 'b'])
+
+    def test_add_course_rejects_duplicates(self):
+        stale = StudentCourse.objects.get(pk=self.student_course.pk)
+        self.assertTrue(self.student_course.add_course({'id': 'a'}))
+        self.assertFalse(self.student_course.add_course({'id': 'a'}))
+        # An instance loaded before the first add must not append a second copy
+        stale.add_course({'id': 'a'})
+        self.assertEqual(self.stored_ids(), ['a'])
+
+    def test_remove_course_from_keeps_the_other_courses(self):
+        StudentCourse.objects.filter(pk=self.student_course.pk).update(courses=[{'id': 'a'}, {'id': 'b'}, {'id': 'c'}])
+        rows = StudentCourse.objects.filter(student=self.student)
+        self.assertEqual(StudentCourse.remove_course_from(rows, 'b'), 1)
+        self.assertEqual(self.stored_ids(), ['a', 'c'])
+
+    def test_remove_course_from_leaves_lists_without_the_course_alone(self):
+        StudentCourse.objects.filter(pk=self.student_course.pk).update(courses=[{'id': 'a'}])
+        updated_at = self.stored().updated_at
+        rows = StudentCourse.objects.filter(student=self.student)
+        self.assertEqual(StudentCourse.remove_course_from(rows, 'x'), 0)
+        self.assertEqual(self.stored().updated_at, updated_at)
+
+    def test_set_grades_writes_only_when_a_grade_changes(self):
+        StudentCourse.objects.filter(pk=self.student_course.pk).update(
+            courses=[{'id': 'a', 'grade': 'A', 'points': 5.0}, {'id': 'b'}]
+        )
+        student_course = self.stored()
+        updated_at = student_course.updated_at
+
+        self.assertEqual(student_course.set_grades({'a': 'A'}), 0)
+        self.assertEqual(self.stored().updated_at, updated_at)
+
+        self.assertEqual(student_course.set_grades({'a': 'A', 'b': 'B+'}), 1)
+        stored = self.stored()
+        self.assertEqual(stored.courses[1], {'id': 'b', 'grade': 'B+', 'points': 4.0})
+        self.assertGreater(stored.updated_at, updated_at)
+
+    def test_course_endpoints_add_and_remove(self):
+        course = Course.objects.create(
+            program=self.program, code='CS101', name='Programming', credits=3, type='core', semester=1, year=1,
+        )
+        response = self.client.post('/api/students/courses/', {'course_id': str(course.id)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/students/courses/', {'course_id': str(course.id)}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.stored_ids(), [str(course.id)])
+
+        self.assertEqual(self.client.delete(f'/api/students/courses/{course.id}/').status_code, 200)
+        self.assertEqual(self.stored_ids(), [])
+        self.assertEqual(self.client.delete(f'/api/students/courses/{uuid.uuid4()}/').status_code, 404)
+
+
+class StudentCourseListFallbackTests(StudentCourseListTests):
+    """The same behaviour through the read-modify-write path used off PostgreSQL."""
+
+    def setUp(self):
+        patcher = mock.patch.object(connection, 'vendor', 'sqlite')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+class ImportOldDataTests(TestCase):
+    def run_import(self, data):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        self.addCleanup(os.remove, path)
+        out = StringIO()
+        call_command('import_old_data', path=path, stdout=out)
+        return out.getvalue()
+
+    def test_single_college_fallback_follows_row_order(self):
+        self.run_import({'programs': [
+            {'name': 'BSc in Computer Science', 'college': 'CoICT'},
+            {'name': 'BSc in Telecommunications'},
+            {'name': 'BSc in Civil Engineering', 'college': 'CoET'},
+            {'name': 'BSc in Mining Engineering'},
+        ]})
+        programs = dict(Program.objects.values_list('name', 'college__name'))
+        self.assertEqual(programs, {
+            'BSc in Computer Science': 'CoICT',
+            # Only CoICT was known when this row was read
+            'BSc in Telecommunications': 'CoICT',
+            'BSc in Civil Engineering': 'CoET',
+        })
+
+    def test_second_import_of_the_same_file_changes_nothing(self):
+        data = {
+            'colleges': [{'name': 'CoICT'}],
+            'programs': [{'name': 'BSc in Computer Science', 'college': 'CoICT', 'duration': 3}],
+            'courses': [
+                {'code': 'CS101', 'name': 'Programming', 'credits': 3, 'semester': 1, 'year': 1,
+                 'program': 'BSc in Computer Science'},
+                {'code': 'CS102', 'name': 'Data Structures', 'credits': 4, 'type': 'elective',
+                 'semester': 2, 'year': 1, 'program': 'BSc in Computer Science'},
+            ],
+        }
+        self.assertIn('+2 created, 0 updated', self.run_import(data))
+        self.assertIn('+0 created, 0 updated', self.run_import(data))
+
+        data['courses'][0]['credits'] = 4
+        self.assertIn('+0 created, 1 updated', self.run_import(data))
+        self.assertEqual(Course.objects.get(code='CS101').credits, 4)
+        self.assertEqual(Course.objects.count(), 2)
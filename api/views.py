@@ -1,10 +1,22 @@
+from functools import wraps
+
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.views.decorators.http import condition
+from django.db.models import F, Q
 from .models import User, University, College, Program, Course, Student, StudentCourse
+from .signals import (
+    PROFILE_OPTIONS_CACHE_KEY, PROFILE_OPTIONS_CACHE_TIMEOUT,
+    CATALOGUE_CACHE_TIMEOUT, catalogue_cache_key,
+)
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserSerializer,
     UniversitySerializer, CollegeSerializer, ProgramSerializer, CourseSerializer,
@@ -13,12 +25,74 @@ from .serializers import (
 )
 
 
-def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
-    return {
-        'refresh': str(refresh),
-        'access': str(refresh.access_token),
-    }
+def get_access_token_for_user(user):
+    # Clients only ever receive the access token, so no refresh token is
+    # built (or signed) just to derive it. The user fields ride along as
+    # claims so a client can read them from the token without another call.
+    token = AccessToken.for_user(user)
+    token['email'] = user.email
+    token['display_name'] = user.display_name
+    return str(token)
+
+
+def get_student(request):
+    """
+    The authenticated user's Student, with everything StudentSerializer reads
+    (including the StudentCourse row), memoized on the request. Usually it was
+    joined to the user by StudentJWTAuthentication; otherwise it is loaded
+    here. Raises Student.DoesNotExist when there is no profile.
+    """
+    try:
+        return request._student
+    except AttributeError:
+        if User.student_profile.is_cached(request.user):
+            student = request.user.student_profile
+        else:
+            student = StudentSerializer.setup_eager_loading(Student.objects).get(user=request.user)
+        request._student = student
+        return student
+
+
+def require_student(view):
+    """
+    Answer 404 before `view` runs when the user has no Student profile. The
+    view reads the student with get_student(request), which is memoized.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            get_student(request)
+        except Student.DoesNotExist:
+            return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def student_courses_etag(request, *args, **kwargs):
+    """
+    ETag for views that render only the student's StudentCourse row, from
+    the row already joined to the student; for use under require_student.
+    None when no course list was saved yet.
+    """
+    try:
+        student_course = get_student(request).student_courses
+    except StudentCourse.DoesNotExist:
+        return None
+    return f'{student_course.pk}:{student_course.updated_at.timestamp()}'
+
+
+def student_profile_etag(request, *args, **kwargs):
+    """
+    ETag for StudentSerializer output: the update times of every joined row
+    it reads, so a catalogue rename shown in the profile changes it too.
+    """
+    student = get_student(request)
+    rows = (
+        student, student.university, student.college,
+        student.program, student.program.college, student.program.college.university,
+    )
+    versions = [f'{row.pk}@{row.updated_at.timestamp()}' for row in rows]
+    return ':'.join(filter(None, [*versions, student_courses_etag(request)]))
 
 
 # Authentication Views
@@ -28,10 +102,10 @@ def register(request):
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.save()
-        token = get_tokens_for_user(user)
+        token = get_access_token_for_user(user)
         return Response({
             'user': UserSerializer(user).data,
-            'token': token['access']
+            'token': token
         }, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -42,19 +116,71 @@ def login(request):
     serializer = UserLoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        token = get_tokens_for_user(user)
+        token = get_access_token_for_user(user)
         return Response({
             'user': UserSerializer(user).data,
-            'token': token['access']
+            'token': token
         }, status=status.HTTP_200_OK)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 # University & Academic Structure Views
+def university_rows(queryset):
+    """UniversitySerializer-shaped dicts read with values(), see college_rows."""
+    return list(queryset.values('id', 'name', 'country'))
+
+
+def college_rows(queryset):
+    """
+    CollegeSerializer-shaped dicts read with values(), so list endpoints
+    neither build model instances nor walk university per row.
+    """
+    return list(queryset.values('id', 'name', 'university', university_name=F('university__name')))
+
+
+def program_rows(queryset):
+    """ProgramSerializer-shaped dicts read with values(), see college_rows."""
+    return list(queryset.values(
+        'id', 'name', 'college', 'duration',
+        college_name=F('college__name'),
+        university_name=F('college__university__name'),
+    ))
+
+
+def course_rows(queryset):
+    """CourseSerializer-shaped dicts read with values(), see college_rows."""
+    return list(queryset.values(
+        'id', 'code', 'name', 'credits', 'type', 'semester', 'year', 'program',
+        program_name=F('program__name'),
+    ))
+
+
+def cached_rows(request, rows, queryset, *key):
+    """
+    Response for rows(queryset), cached until the catalogue next changes (see
+    api.signals). The versioned cache key doubles as the ETag, so a client
+    holding the current one gets a 304 without the rows being read at all.
+    A per-process cache would miss invalidations made by other workers and by
+    the import commands, so without a shared one the rows are read every time.
+    """
+    if not settings.CACHE_IS_SHARED:
+        return Response(rows(queryset))
+    cache_key = catalogue_cache_key(*key)
+    etag = quote_etag(cache_key)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(cache.get_or_set(cache_key, lambda: rows(queryset), CATALOGUE_CACHE_TIMEOUT))
+    response.headers['ETag'] = etag
+    return response
+
+
 class UniversityListView(generics.ListAPIView):
     queryset = University.objects.all()
     serializer_class = UniversitySerializer
     permission_classes = [permissions.AllowAny]
+    
+    def list(self, request, *args, **kwargs):
+        return cached_rows(request, university_rows, self.get_queryset(), 'universities')
 
 
 class CollegeListView(generics.ListAPIView):
@@ -63,7 +189,10 @@ class CollegeListView(generics.ListAPIView):
     
     def get_queryset(self):
         university_id = self.kwargs['university_id']
-        return College.objects.filter(university_id=university_id)
+        return CollegeSerializer.setup_eager_loading(College.objects.filter(university_id=university_id))
+    
+    def list(self, request, *args, **kwargs):
+        return cached_rows(request, college_rows, self.get_queryset(), 'colleges', self.kwargs['university_id'])
 
 
 class ProgramListView(generics.ListAPIView):
@@ -72,42 +201,52 @@ class ProgramListView(generics.ListAPIView):
     
     def get_queryset(self):
         college_id = self.kwargs['college_id']
-        return Program.objects.filter(college_id=college_id)
+        return ProgramSerializer.setup_eager_loading(Program.objects.filter(college_id=college_id))
+    
+    def list(self, request, *args, **kwargs):
+        return cached_rows(request, program_rows, self.get_queryset(), 'programs', self.kwargs['college_id'])
 
 
 class CourseListView(generics.ListAPIView):
     serializer_class = CourseSerializer
     permission_classes = [permissions.AllowAny]
     
-    def get_queryset(self):
-        program_id = self.kwargs['program_id']
-        year = self.request.query_params.get('year')
-        semester = self.request.query_params.get('semester')
-        
-        queryset = Course.objects.filter(program_id=program_id)
-        
-        if year:
-            queryset = queryset.filter(year=int(year))
-        if semester:
-            queryset = queryset.filter(semester=int(semester))
-        
-        return queryset
+    def get_filters(self):
+        # Anything but plain ASCII digits is ignored rather than reaching int(),
+        # which rejects characters isdigit() accepts, such as superscript two
+        filters = {'program_id': self.kwargs['program_id']}
+        for param in ('year', 'semester'):
+            value = self.request.query_params.get(param)
+            if value and value.isascii() and value.isdecimal():
+                filters[param] = int(value)
+        return filters
+    
+    def get_queryset(self, filters=None):
+        if filters is None:
+            filters = self.get_filters()
+        return CourseSerializer.setup_eager_loading(
+            Course.objects.filter(**filters)
+        ).order_by('year', 'semester', 'code')
+    
+    def list(self, request, *args, **kwargs):
+        # Parsed once; the same filters key the cache and build the queryset
+        filters = self.get_filters()
+        key = ('courses', filters['program_id'], filters.get('year'), filters.get('semester'))
+        return cached_rows(request, course_rows, self.get_queryset(filters), *key)
 
 
 # Student Management Views
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@require_student
+@condition(etag_func=student_profile_etag)
 def student_data(request):
     """
     Get student data directly (without wrapper)
     Returns: university, college, program, year, semester, courses
     """
-    try:
-        student = Student.objects.get(user=request.user)
-        serializer = StudentSerializer(student)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    except Student.DoesNotExist:
-        return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    serializer = StudentSerializer(get_student(request))
+    return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
@@ -120,7 +259,7 @@ def student_profile_create(request):
     - Response payload matches StudentSerializer (includes courses array)
     """
     try:
-        existing = Student.objects.get(user=request.user)
+        existing = get_student(request)
         return Response({
             'error': 'Student profile already exists',
             'has_profile': True,
@@ -154,7 +293,7 @@ def student_profile(request):
     PATCH: Partial update student profile (update only provided fields)
     """
     try:
-        student = Student.objects.get(user=request.user)
+        student = get_student(request)
     except Student.DoesNotExist:
         student = None
     
@@ -245,17 +384,28 @@ def student_profile(request):
 def student_profile_options(request):
     """Get available options for creating/updating student profile"""
     try:
-        universities = University.objects.all()
-        colleges = College.objects.all()
-        programs = Program.objects.all()
+        def build_options():
+            return {
+                'universities': university_rows(University.objects.all()),
+                'colleges': college_rows(College.objects.all()),
+                'programs': program_rows(Program.objects.all()),
+                'year_choices': [1, 2, 3, 4, 5],  # Common academic years
+                'semester_choices': [1, 2]  # Common semesters
+            }
+
+        # Same for every user and rarely changes; see api.signals for
+        # invalidation, which only reaches every process through a shared cache
+        if settings.CACHE_IS_SHARED:
+            options = cache.get_or_set(PROFILE_OPTIONS_CACHE_KEY, build_options, PROFILE_OPTIONS_CACHE_TIMEOUT)
+        else:
+            options = build_options()
         
-        return Response({
-            'universities': UniversitySerializer(universities, many=True).data,
-            'colleges': CollegeSerializer(colleges, many=True).data,
-            'programs': ProgramSerializer(programs, many=True).data,
-            'year_choices': [1, 2, 3, 4, 5],  # Common academic years
-            'semester_choices': [1, 2]  # Common semesters
-        }, status=status.HTTP_200_OK)
+        response = Response(options, status=status.HTTP_200_OK)
+        # Private: the endpoint needs a login, so shared caches must not keep it.
+        # no-cache makes clients revalidate every time, so a catalogue edit shows
+        # up at once; ConditionalGetMiddleware answers an unchanged copy with 304
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
         
     except Exception as e:
         return Response({
@@ -266,33 +416,30 @@ def student_profile_options(request):
 
 # Course Management Views
 
+def load_student_courses(user):
+    """
+    Read the user's stored course list, from the Student authentication
+    already joined when there is one, else straight through the LEFT JOIN
+    without building Student or StudentCourse instances. Raises
+    Student.DoesNotExist when there is no profile, returns None when no
+    courses were saved yet.
+    """
+    if User.student_profile.is_cached(user):
+        student_course = getattr(user.student_profile, 'student_courses', None)
+        return student_course.courses if student_course is not None else None
+    return Student.objects.values_list('student_courses__courses', flat=True).get(user=user)
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_student_courses_by_semester(request, semester, year):
     """Get courses for a specific semester and year for the authenticated student"""
     try:
-        student = Student.objects.get(user=request.user)
+        courses = load_student_courses(request.user)
     except Student.DoesNotExist:
         return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    try:
-        student_course = StudentCourse.objects.get(student=student)
-        courses = student_course.courses or []
-        
-        # Filter courses by semester and year
-        filtered_courses = [
-            course for course in courses 
-            if course.get('semester') == semester and course.get('year') == year
-        ]
-        
-        return Response({
-            'semester': semester,
-            'year': year,
-            'courses': filtered_courses,
-            'total_courses': len(filtered_courses)
-        }, status=status.HTTP_200_OK)
-        
-    except StudentCourse.DoesNotExist:
+    if courses is None:
         return Response({
             'semester': semester,
             'year': year,
@@ -300,6 +447,19 @@ def get_student_courses_by_semester(request, semester, year):
             'total_courses': 0,
             'message': 'No courses found for this student'
         }, status=status.HTTP_200_OK)
+    
+    # Filter courses by semester and year
+    filtered_courses = [
+        course for course in courses 
+        if course.get('semester') == semester and course.get('year') == year
+    ]
+    
+    return Response({
+        'semester': semester,
+        'year': year,
+        'courses': filtered_courses,
+        'total_courses': len(filtered_courses)
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
@@ -307,53 +467,20 @@ def get_student_courses_by_semester(request, semester, year):
 def get_student_courses_filtered(request):
     """Get courses for the authenticated student with optional semester/year filtering"""
     try:
-        student = Student.objects.get(user=request.user)
+        courses = load_student_courses(request.user)
     except Student.DoesNotExist:
         return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    try:
-        student_course = StudentCourse.objects.get(student=student)
-        courses = student_course.courses or []
-        
-        # Get filter parameters from query string
-        semester = request.query_params.get('semester')
-        year = request.query_params.get('year')
-        course_type = request.query_params.get('type')  # 'core' or 'elective'
-        
-        # Apply filters
-        filtered_courses = courses
-        
-        if semester is not None:
-            semester = int(semester)
-            filtered_courses = [
-                course for course in filtered_courses 
-                if course.get('semester') == semester
-            ]
-        
-        if year is not None:
-            year = int(year)
-            filtered_courses = [
-                course for course in filtered_courses 
-                if course.get('year') == year
-            ]
-        
-        if course_type:
-            filtered_courses = [
-                course for course in filtered_courses 
-                if course.get('type') == course_type
-            ]
-        
-        return Response({
-            'filters': {
-                'semester': semester,
-                'year': year,
-                'type': course_type
-            },
-            'courses': filtered_courses,
-            'total_courses': len(filtered_courses)
-        }, status=status.HTTP_200_OK)
-        
-    except StudentCourse.DoesNotExist:
+    # Get filter parameters from query string
+    semester = request.query_params.get('semester')
+    year = request.query_params.get('year')
+    course_type = request.query_params.get('type')  # 'core' or 'elective'
+    if semester is not None:
+        semester = int(semester)
+    if year is not None:
+        year = int(year)
+    
+    if courses is None:
         return Response({
             'filters': {
                 'semester': semester,
@@ -364,6 +491,27 @@ def get_student_courses_filtered(request):
             'total_courses': 0,
             'message': 'No courses found for this student'
         }, status=status.HTTP_200_OK)
+    
+    # Apply all filters in a single pass, or none at all when none were given
+    if semester is None and year is None and not course_type:
+        filtered_courses = courses
+    else:
+        filtered_courses = [
+            course for course in courses
+            if (semester is None or course.get('semester') == semester)
+            and (year is None or course.get('year') == year)
+            and (not course_type or course.get('type') == course_type)
+        ]
+    
+    return Response({
+        'filters': {
+            'semester': semester,
+            'year': year,
+            'type': course_type
+        },
+        'courses': filtered_courses,
+        'total_courses': len(filtered_courses)
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
@@ -379,22 +527,9 @@ def save_courses_batch(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get or create student profile
-        try:
-            student = Student.objects.get(user=request.user)
-        except Student.DoesNotExist:
-            return Response(
-                {'error': 'Student profile not found'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Get or create StudentCourse record
-        student_course, created = StudentCourse.objects.get_or_create(student=student)
-        
         # Format courses data for storage in JSON field
-        formatted_courses = []
-        for course_data in courses_data:
-            formatted_course = {
+        formatted_courses = [
+            {
                 'id': course_data.get('course_id'),
                 'code': course_data.get('course_code'),
                 'name': course_data.get('course_name'),
@@ -404,11 +539,24 @@ def save_courses_batch(request):
                 'year': course_data.get('year'),
                 'added_at': None  # Will be set when saved
             }
-            formatted_courses.append(formatted_course)
+            for course_data in courses_data
+        ]
         
-        # Store all courses in the JSON field
-        student_course.courses = formatted_courses
-        student_course.save()
+        # Store all courses in the JSON field. The StudentCourse row usually
+        # exists already, so a single UPDATE through the user join both finds
+        # and writes it; the student is only looked up when it doesn't
+        saved = StudentCourse.objects.filter(student__user=request.user).update(
+            courses=formatted_courses, updated_at=timezone.now()
+        )
+        if not saved:
+            try:
+                student = Student.objects.get(user=request.user)
+            except Student.DoesNotExist:
+                return Response(
+                    {'error': 'Student profile not found'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            StudentCourse.objects.update_or_create(student=student, defaults={'courses': formatted_courses})
         
         return Response({
             'message': f'Successfully saved {len(formatted_courses)} courses',
@@ -425,56 +573,58 @@ def save_courses_batch(request):
 @api_view(['DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def remove_course(request, course_id):
-    try:
-        student = Student.objects.get(user=request.user)
-    except Student.DoesNotExist:
-        return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    # Remove straight through the user join; which 404 applies is only worked
+    # out when nothing was removed
+    if StudentCourse.remove_course_from(StudentCourse.objects.filter(student__user=request.user), course_id):
+        return Response({'message': 'Course removed successfully'}, status=status.HTTP_200_OK)
     
-    try:
-        student_course = StudentCourse.objects.get(student=student)
-        if student_course.remove_course(course_id):
-            return Response({'message': 'Course removed successfully'}, status=status.HTTP_200_OK)
-        else:
-            return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
-    except StudentCourse.DoesNotExist:
+    student_course_ids = list(Student.objects.filter(user=request.user).values_list('student_courses', flat=True))
+    if not student_course_ids:
+        return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    if student_course_ids[0] is None:
         return Response({'error': 'No courses found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
 
 
 @api_view(['GET', 'POST', 'PUT'])
 @permission_classes([permissions.IsAuthenticated])
+@require_student
+@condition(etag_func=student_courses_etag)
 def student_courses(request):
-    try:
-        student = Student.objects.get(user=request.user)
-    except Student.DoesNotExist:
-        return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    student = get_student(request)
     
-    # Get or create StudentCourse record
-    student_course, created = StudentCourse.objects.get_or_create(student=student)
+    # Get or create StudentCourse record; usually it came joined to the student
+    try:
+        student_course = student.student_courses
+    except StudentCourse.DoesNotExist:
+        student_course, created = StudentCourse.objects.get_or_create(student=student)
     
     if request.method == 'GET':
-        serializer = StudentCourseSerializer(student_course)
-        return Response(serializer.data)
+        # ?limit=/&offset= pages the stored list; without them the whole record
+        # is returned as before
+        paginator = LimitOffsetPagination()
+        page = paginator.paginate_queryset(student_course.courses or [], request)
+        if page is not None:
+            return paginator.get_paginated_response(page)
+        # to_representation already returns a plain dict; .data would only copy
+        # it into a ReturnDict before the renderer sees it
+        return Response(StudentCourseSerializer().to_representation(student_course))
     
     elif request.method == 'POST':
         # Add single course
         serializer = CourseAddSerializer(data=request.data)
         if serializer.is_valid():
             course_id = serializer.validated_data['course_id']
-            course = get_object_or_404(Course, id=course_id)
+            # Read just the columns stored on the list, already shaped as an entry
+            course = get_object_or_404(
+                Course.objects.values('id', 'code', 'name', 'credits', 'type', 'semester', 'year'),
+                id=course_id,
+            )
             
             # Prepare course data
-            course_data = {
-                'id': str(course.id),
-                'code': course.code,
-                'name': course.name,
-                'credits': course.credits,
-                'type': course.type,
-                'semester': course.semester,
-                'year': course.year,
-                'added_at': None
-            }
+            course_data = {**course, 'id': str(course['id']), 'added_at': None}
             
             # Add course to JSON field
             if student_course.add_course(course_data):
@@ -521,13 +671,17 @@ def student_courses(request):
 
 
 # GPA Calculation Views
+# Grade every ungraded course needs for a target GPA of at least the
+# threshold, checked from the highest threshold down
+TARGET_GRADE_LADDER = ((4.5, 'A'), (4.0, 'B+'), (0.0, 'B'))
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@require_student
+@condition(etag_func=student_courses_etag)
 def calculate_gpa(request):
-    try:
-        student = Student.objects.get(user=request.user)
-    except Student.DoesNotExist:
-        return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    student = get_student(request)
     
     gpa_data = student.get_gpa_breakdown()
     return Response(gpa_data)
@@ -535,38 +689,41 @@ def calculate_gpa(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@require_student
 def generate_target_gpa(request):
-    try:
-        student = Student.objects.get(user=request.user)
-    except Student.DoesNotExist:
-        return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    student = get_student(request)
     
     serializer = TargetGPASerializer(data=request.data)
     if serializer.is_valid():
         target_gpa = serializer.validated_data['target_gpa']
         
         # Get current GPA
-        current_gpa = student.get_gpa()
+        current_gpa = student.get_gpa_breakdown()['gpa']
         
-        # Simple target GPA calculation - set all ungraded courses to required grade
-        student_courses = StudentCourse.objects.filter(student=student)
-        grades = []
-        
-        for student_course in student_courses:
-            if not student_course.grade:
-                # Calculate required grade for target GPA
-                # This is a simplified calculation
-                required_grade = 'A' if target_gpa >= 4.5 else 'B+' if target_gpa >= 4.0 else 'B'
-                required_points = StudentCourse.GRADE_POINTS[required_grade]
-                
-                grades.append({
-                    'course_id': str(student_course.course.id),
-                    'course_code': student_course.course.code,
-                    'course_name': student_course.course.name,
-                    'credits': student_course.course.credits,
-                    'required_grade': required_grade,
-                    'required_points': required_points
-                })
+        # Simple target GPA calculation - set all ungraded courses to required grade.
+        # The course list came with the student, so this is one pass over it
+        try:
+            courses = student.student_courses.courses or []
+        except StudentCourse.DoesNotExist:
+            courses = []
+        # Calculate required grade for target GPA; it only depends on the
+        # target, so it's the same for every ungraded course
+        # This is a simplified calculation
+        required_grade = next(grade for threshold, grade in TARGET_GRADE_LADDER if target_gpa >= threshold)
+        required_points = StudentCourse.GRADE_POINTS[required_grade]
+        
+        grades = [
+            {
+                'course_id': str(course.get('id')),
+                'course_code': course.get('code'),
+                'course_name': course.get('name'),
+                'credits': course.get('credits'),
+                'required_grade': required_grade,
+                'required_points': required_points
+            }
+            for course in courses
+            if not course.get('grade')
+        ]
         
         # Calculate accuracy
         accuracy = "excellent" if abs(current_gpa - target_gpa) < 0.1 else "good" if abs(current_gpa - target_gpa) < 0.3 else "needs_improvement"
@@ -584,20 +741,18 @@ def generate_target_gpa(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@require_student
 def reset_grades(request):
-    try:
-        student = Student.objects.get(user=request.user)
-    except Student.DoesNotExist:
-        return Response({'error': 'Student profile not found'}, status=status.HTTP_404_NOT_FOUND)
-    
-    # Reset all grades to A
-    student_courses = StudentCourse.objects.filter(student=student)
-    updated_count = 0
+    student = get_student(request)
     
-    for student_course in student_courses:
-        student_course.grade = 'A'
-        student_course.save()
-        updated_count += 1
+    # Reset all grades to A: one UPDATE of the joined course list, skipped
+    # entirely when every course already has an A
+    try:
+        student_course = student.student_courses
+    except StudentCourse.DoesNotExist:
+        updated_count = 0
+    else:
+        updated_count = student_course.set_grades({course.get('id'): 'A' for course in student_course.courses or []})
     
     return Response({
         'message': 'All grades reset to A',